@@ -1,10 +1,23 @@
 # backend/app/__init__.py
+import os
 from flask import Flask
 from flask_cors import CORS
 from flask_socketio import SocketIO
 from flask_jwt_extended import JWTManager
 from .config import Config
+from .schema import upgrade_schema
 from .models import db
+from .services.state_backend import state
+from .services.session_writer import session_writer
+from .services.presence_service import presence
+from .services.recovery_service import recovery
+from .services.auth_service import revocations
+from .services.password_service import password_hasher
+from .services.question_cache import question_cache
+from .services.scoring_service import keyword_scorer
+from .services.practice_service import practice_queues
+from .services.leaderboard_service import leaderboard
+from .services.redemption_service import redemption_processor
 
 socketio = SocketIO()
 jwt = JWTManager()
@@ -19,103 +32,74 @@ def create_app(config_class=Config):
     db.init_app(app)
     CORS(app)
     jwt.init_app(app)
-    socketio.init_app(app, cors_allowed_origins="*", async_mode='threading')
+    revocations.init_app(app, jwt)
+    password_hasher.init_app(app)
+    question_cache.init_app(app)
+    keyword_scorer.init_app(app)
+    practice_queues.init_app(app)
+    socketio.init_app(app, cors_allowed_origins="*", async_mode='threading',
+                      message_queue=app.config['SOCKETIO_MESSAGE_QUEUE'])
+    state.init_app(app)
+    session_writer.init_app(app)
     
     # Register blueprints
-    from .routes import auth, student, teacher, training, points, video
+    from .routes import auth, student, teacher, training, points, video, metrics, admin, leaderboard as leaderboard_routes
     app.register_blueprint(auth.bp)
     app.register_blueprint(student.bp)
     app.register_blueprint(teacher.bp)
     app.register_blueprint(training.bp)
     app.register_blueprint(points.bp)
     app.register_blueprint(video.bp)
+    app.register_blueprint(metrics.bp)
+    app.register_blueprint(admin.bp)
+    app.register_blueprint(leaderboard_routes.bp)
+    
+    # Register CLI commands
+    from .cli import register_commands
+    register_commands(app)
     
     # Register Socket.IO handlers
     from . import socketio_handlers
+    presence.init_app(app, socketio)
     
     # Create database tables
     with app.app_context():
         db.create_all()
+        # Add columns that create_all does not add to existing tables
+        upgrade_schema()
         # Seed initial questions
         seed_questions()
+        # Sessions spilled by the previous process, written before recovery runs
+        session_writer.replay()
+    
+    # Token revocations are polled from users.tokens_valid_after, which now exists
+    revocations.start()
+    
+    # Rebuild call state left active by the previous process
+    recovery.init_app(app, socketio)
+    
+    # Rank boards are rebuilt from the database in the background
+    leaderboard.init_app(app)
+    redemption_processor.init_app(app)
     
     return app
 
 
+SEED_QUESTIONS_PATH = os.path.join(os.path.dirname(__file__), 'data', 'seed_questions.jsonl')
+
+
 def seed_questions():
     from .models.question import Question
+    from .services.onboarding_service import read_rows
+    from .services.question_bank_service import import_questions
     
     # Check if questions already exist
     if Question.query.first():
         return
     
-    questions = [
-        # Easy MCQs
-        Question(
-            question_text="What is the past tense of 'go'?",
-            question_type='mcq',
-            difficulty='easy',
-            points_value=10,
-            option_a='goed',
-            option_b='went',
-            option_c='gone',
-            option_d='going',
-            correct_answer='B'
-        ),
-        Question(
-            question_text="Choose the correct article: ___ apple a day keeps the doctor away.",
-            question_type='mcq',
-            difficulty='easy',
-            points_value=10,
-            option_a='A',
-            option_b='An',
-            option_c='The',
-            option_d='No article',
-            correct_answer='B'
-        ),
-        # Medium MCQs
-        Question(
-            question_text="Which sentence is grammatically correct?",
-            question_type='mcq',
-            difficulty='medium',
-            points_value=20,
-            option_a='She don\'t like coffee',
-            option_b='She doesn\'t likes coffee',
-            option_c='She doesn\'t like coffee',
-            option_d='She don\'t likes coffee',
-            correct_answer='C'
-        ),
-        # Hard MCQs
-        Question(
-            question_text="Choose the correct form: By next year, I ___ my degree.",
-            question_type='mcq',
-            difficulty='hard',
-            points_value=30,
-            option_a='will complete',
-            option_b='will have completed',
-            option_c='would complete',
-            option_d='complete',
-            correct_answer='B'
-        ),
-        # Speaking prompts
-        Question(
-            question_text="Introduce yourself in English (Name, age, profession)",
-            question_type='speaking',
-            difficulty='easy',
-            points_value=10,
-            expected_keywords='["name", "age", "profession", "my"]'
-        ),
-        Question(
-            question_text="Describe your daily routine",
-            question_type='speaking',
-            difficulty='medium',
-            points_value=20,
-            expected_keywords='["wake", "morning", "work", "evening", "sleep"]'
-        ),
-    ]
-    
-    db.session.bulk_save_objects(questions)
-    db.session.commit()
+    # Starter bank; larger banks are loaded with `flask import-questions`
+    with open(SEED_QUESTIONS_PATH, encoding='utf-8') as f:
+        import_questions(read_rows(f, 'jsonl'))
 
 from flask import render_template
 
@@ -180,27 +164,57 @@ def create_app(config_class=Config):
     db.init_app(app)
     CORS(app)
     jwt.init_app(app)
-    socketio.init_app(app, cors_allowed_origins="*", async_mode='threading')
+    revocations.init_app(app, jwt)
+    password_hasher.init_app(app)
+    question_cache.init_app(app)
+    keyword_scorer.init_app(app)
+    practice_queues.init_app(app)
+    socketio.init_app(app, cors_allowed_origins="*", async_mode='threading',
+                      message_queue=app.config['SOCKETIO_MESSAGE_QUEUE'])
+    state.init_app(app)
+    session_writer.init_app(app)
     
     # Register blueprints
-    from .routes import auth, student, teacher, training, points, video
+    from .routes import auth, student, teacher, training, points, video, metrics, admin, leaderboard as leaderboard_routes
     app.register_blueprint(auth.bp)
     app.register_blueprint(student.bp)
     app.register_blueprint(teacher.bp)
     app.register_blueprint(training.bp)
     app.register_blueprint(points.bp)
     app.register_blueprint(video.bp)
+    app.register_blueprint(metrics.bp)
+    app.register_blueprint(admin.bp)
+    app.register_blueprint(leaderboard_routes.bp)
+    
+    # Register CLI commands
+    from .cli import register_commands
+    register_commands(app)
     
     # Register page routes
     register_page_routes(app)
     
     # Register Socket.IO handlers
     from . import socketio_handlers
+    presence.init_app(app, socketio)
     
     # Create database tables
     with app.app_context():
         db.create_all()
+        # Add columns that create_all does not add to existing tables
+        upgrade_schema()
         # Seed initial questions
         seed_questions()
+        # Sessions spilled by the previous process, written before recovery runs
+        session_writer.replay()
+    
+    # Token revocations are polled from users.tokens_valid_after, which now exists
+    revocations.start()
+    
+    # Rebuild call state left active by the previous process
+    recovery.init_app(app, socketio)
+    
+    # Rank boards are rebuilt from the database in the background
+    leaderboard.init_app(app)
+    redemption_processor.init_app(app)
     
     return app    
\ No newline at end of file
@@ -0,0 +1,118 @@
+# backend/app/cli.py
+import csv
+import sys
+import click
+from .services.onboarding_service import read_rows, import_users
+from .services.question_bank_service import import_questions, export_questions
+from .services.ledger_service import reconcile_balances
+from .services.redemption_service import redemption_processor, create_adapter
+from .services.rollup_service import rollup_transactions
+from .schema import upgrade_schema
+
+def register_commands(app):
+    """Register Flask CLI commands (run with FLASK_APP=backend.app:create_app)"""
+    
+    @app.cli.command('upgrade-db')
+    @click.option('--backfill/--no-backfill', default=True,
+                  help='Recompute derived data such as training progress')
+    def upgrade_db_command(backfill):
+        """Bring an existing database up to the current models (safe to re-run)."""
+        for change in upgrade_schema(backfill=backfill):
+            click.echo(change)
+    
+    @app.cli.command('import-users')
+    @click.argument('path', type=click.Path(exists=True, dir_okay=False))
+    @click.option('--role', type=click.Choice(['student', 'teacher']), default='student')
+    @click.option('--format', 'fmt', type=click.Choice(['csv', 'jsonl']), default=None,
+                  help='Defaults to the file extension')
+    @click.option('--chunk-size', type=int, default=1000)
+    @click.option('--workers', type=int, default=None, help='Hashing processes (default: all cores)')
+    @click.option('--errors', 'errors_path', type=click.Path(dir_okay=False), default=None,
+                  help='Write the per-row error report to this CSV file')
+    def import_users_command(path, role, fmt, chunk_size, workers, errors_path):
+        """Bulk import students or teachers from a CSV or JSONL file."""
+        fmt = fmt or ('jsonl' if path.endswith('.jsonl') else 'csv')
+        
+        with open(path, encoding='utf-8-sig', newline='') as f:
+            report = import_users(read_rows(f, fmt), role, chunk_size=chunk_size, workers=workers)
+        
+        click.echo(f"Created {report['created']} {role}s, {len(report['errors'])} rows rejected")
+        
+        if report['errors']:
+            out = open(errors_path, 'w', newline='') if errors_path else sys.stdout
+            writer = csv.DictWriter(out, fieldnames=['row', 'email', 'error'])
+            writer.writeheader()
+            writer.writerows(report['errors'])
+            if errors_path:
+                out.close()
+    
+    @app.cli.command('import-questions')
+    @click.argument('path', type=click.Path(exists=True, dir_okay=False))
+    @click.option('--format', 'fmt', type=click.Choice(['csv', 'jsonl']), default=None,
+                  help='Defaults to the file extension')
+    @click.option('--batch-size', type=int, default=1000)
+    @click.option('--deactivate-missing', is_flag=True,
+                  help='Deactivate questions whose external_id is not in the file')
+    def import_questions_command(path, fmt, batch_size, deactivate_missing):
+        """Upsert questions by external_id from a CSV or JSONL file."""
+        fmt = fmt or ('jsonl' if path.endswith('.jsonl') else 'csv')
+        
+        with open(path, encoding='utf-8-sig', newline='') as f:
+            report = import_questions(read_rows(f, fmt), batch_size=batch_size,
+                                      deactivate_missing=deactivate_missing)
+        
+        click.echo(f"Upserted {report['upserted']} questions, {report['rejected']} rows rejected, "
+                   f"{report['deactivated']} deactivated")
+        for error in report['errors']:
+            click.echo(f"row {error['row']} ({error['external_id']}): {error['error']}", err=True)
+    
+    @app.cli.command('export-questions')
+    @click.argument('path', type=click.Path(dir_okay=False), required=False)
+    @click.option('--format', 'fmt', type=click.Choice(['csv', 'jsonl']), default='jsonl')
+    def export_questions_command(path, fmt):
+        """Write the question bank as CSV or JSONL to PATH (default: stdout)."""
+        out = open(path, 'w', encoding='utf-8', newline='') if path else sys.stdout
+        for chunk in export_questions(fmt):
+            out.write(chunk)
+        if path:
+            out.close()
+    
+    @app.cli.command('reconcile-points')
+    @click.option('--repair', is_flag=True, help='Set drifted balances to the ledger sum')
+    @click.option('--chunk-size', type=int, default=1000)
+    def reconcile_points_command(repair, chunk_size):
+        """Check student point balances against the points_transactions ledger."""
+        report = reconcile_balances(repair=repair, chunk_size=chunk_size)
+        
+        click.echo(f"Checked {report['checked']} students, {report['mismatched']} balances drifted, "
+                   f"{report['repaired']} repaired")
+        for mismatch in report['mismatches']:
+            click.echo(f"student {mismatch['student_id']}: balance {mismatch['balance']}, "
+                       f"ledger {mismatch['ledger']}", err=True)
+    
+    @app.cli.command('process-redemptions')
+    @click.option('--adapter', default=None, help="Payout adapter (default: REDEMPTION_PAYOUT_ADAPTER)")
+    @click.option('--limit', type=int, default=None, help='Stop after this many requests')
+    def process_redemptions_command(adapter, limit):
+        """Pay out pending redemption requests and refund failed payouts."""
+        adapter = adapter or app.config['REDEMPTION_PAYOUT_ADAPTER']
+        if not adapter:
+            raise click.UsageError('No payout adapter configured; pass --adapter')
+        
+        report = redemption_processor.process(create_adapter(adapter), limit=limit)
+        
+        click.echo(f"Approved {report['approved']}, rejected and refunded {report['rejected']}, "
+                   f"{report['unknown']} with unknown payout outcome")
+    
+    @app.cli.command('rollup-points')
+    @click.option('--horizon-days', type=int, default=None, help='Default: POINTS_ROLLUP_HORIZON_DAYS')
+    @click.option('--chunk-size', type=int, default=None, help='Default: POINTS_ROLLUP_CHUNK_SIZE')
+    def rollup_points_command(horizon_days, chunk_size):
+        """Archive old points transactions into per-student monthly summaries."""
+        report = rollup_transactions(
+            horizon_days if horizon_days is not None else app.config['POINTS_ROLLUP_HORIZON_DAYS'],
+            chunk_size=chunk_size or app.config['POINTS_ROLLUP_CHUNK_SIZE']
+        )
+        
+        click.echo(f"Archived {report['archived']} transactions before {report['cutoff']} "
+                   f"into {report['summaries']} monthly summary updates")
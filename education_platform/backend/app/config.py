@@ -13,15 +13,76 @@ class Config:
     # JWT
     JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY', 'jwt-secret-key-change-in-production')
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=24)
+    REVOCATION_REFRESH_SECONDS = 5  # how often deactivations/role changes are picked up
+    
+    # Admin API (X-Admin-Key header); admin endpoints are disabled when unset
+    ADMIN_API_KEY = os.getenv('ADMIN_API_KEY')
+    
+    # Password hashing runs in a process pool; 0 workers hashes inline
+    PASSWORD_HASH_METHOD = os.getenv('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1')
+    PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', 2))
+    PASSWORD_HASH_MAX_PENDING = 64
+    PASSWORD_HASH_QUEUE_TIMEOUT = 10  # seconds
     
     # Socket.IO
     SOCKETIO_CORS_ALLOWED_ORIGINS = os.getenv('CORS_ORIGINS', '*')
+    SOCKETIO_MESSAGE_QUEUE = os.getenv('SOCKETIO_MESSAGE_QUEUE')  # e.g. redis://localhost:6379/0
+    
+    # Matchmaking/session state: 'memory' for one process, 'sqlite' to share between workers
+    STATE_BACKEND = os.getenv('STATE_BACKEND', 'memory')
+    STATE_DB_PATH = os.getenv('STATE_DB_PATH', 'state.db')
+    STATE_WORKER_TIMEOUT_SECONDS = 30  # a worker silent this long is treated as stopped
+    
+    # Matching order: 'fifo', or 'balanced' (least-loaded teacher first, optional
+    # head start in seconds per proficiency bucket for lower-progress students)
+    MATCHING_POLICY = os.getenv('MATCHING_POLICY', 'fifo')
+    MATCHING_PROFICIENCY_BOOST = int(os.getenv('MATCHING_PROFICIENCY_BOOST', 0))
+    
+    # Write-behind persistence of video session records
+    SESSION_WRITER_QUEUE_SIZE = 10000
+    SESSION_WRITER_BATCH_SIZE = 200
+    SESSION_WRITER_PUT_TIMEOUT = 5  # seconds a full queue may block a handler
+    SESSION_WRITER_MAX_BACKOFF = 30  # seconds between retries while the database is unreachable
+    SESSION_WRITER_SPILL_PATH = os.getenv('SESSION_WRITER_SPILL_PATH', 'session_writer_spill.jsonl')
+    
+    # Presence: clients emit 'heartbeat'; silent sids are evicted after the timeout
+    PRESENCE_TIMEOUT_SECONDS = int(os.getenv('PRESENCE_TIMEOUT_SECONDS', 90))
+    PRESENCE_TICK_SECONDS = 1
+    
+    # After a restart, rooms left active wait this long for both peers to resume
+    SESSION_RESUME_GRACE_SECONDS = int(os.getenv('SESSION_RESUME_GRACE_SECONDS', 60))
     
     # Points system
     POINTS_EASY = 10
     POINTS_MEDIUM = 20
     POINTS_HARD = 30
     
+    # Question bank cache: how often to check the shared version stamp
+    QUESTION_CACHE_CHECK_SECONDS = 5
+    
+    # Speaking answers pass when this fraction of expected keywords is present
+    SPEAKING_PASS_RATIO = 0.5
+    
+    # Per-student practice queues (question ids), topped up in the background
+    PRACTICE_QUEUE_SIZE = 50
+    PRACTICE_QUEUE_LOW_WATERMARK = 10
+    PRACTICE_REPEAT_GAP = 3  # a wrong answer comes back after this many questions
+    PRACTICE_QUEUE_MAX_QUEUES = 10000  # least recently used queues are dropped beyond this
+    
+    # Leaderboards are kept in memory and fully rebuilt from the database this often
+    LEADERBOARD_REBUILD_SECONDS = 300
+    
+    # Redemption payouts: adapter 'fake' or 'package.module:Class'; the background
+    # worker runs only when an adapter is set and the interval is non-zero
+    REDEMPTION_PAYOUT_ADAPTER = os.getenv('REDEMPTION_PAYOUT_ADAPTER')
+    REDEMPTION_WORKER_INTERVAL = int(os.getenv('REDEMPTION_WORKER_INTERVAL', 30))
+    REDEMPTION_CHUNK_SIZE = 500
+    REDEMPTION_CLAIM_TIMEOUT_SECONDS = 600
+    
+    # Points transactions older than this (whole months) are rolled up and archived
+    POINTS_ROLLUP_HORIZON_DAYS = int(os.getenv('POINTS_ROLLUP_HORIZON_DAYS', 90))
+    POINTS_ROLLUP_CHUNK_SIZE = 5000
+    
     # Pagination
     ITEMS_PER_PAGE = 20
 
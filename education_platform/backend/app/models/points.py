@@ -4,11 +4,14 @@ from datetime import datetime
 
 class PointsTransaction(db.Model):
     __tablename__ = 'points_transactions'
+    __table_args__ = (
+        db.Index('ix_points_transactions_student_created', 'student_id', 'created_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     student_id = db.Column(db.Integer, db.ForeignKey('students.id'), nullable=False)
     points = db.Column(db.Integer, nullable=False)
-    transaction_type = db.Column(db.String(20), nullable=False)  # 'earned' or 'redeemed'
+    transaction_type = db.Column(db.String(20), nullable=False)  # 'earned', 'redeemed' or 'refunded'
     description = db.Column(db.String(200))
     question_id = db.Column(db.Integer, db.ForeignKey('questions.id'))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -23,18 +26,71 @@ class PointsTransaction(db.Model):
         }
 
 
+class PointsTransactionArchive(db.Model):
+    """Raw transactions moved out of points_transactions by the monthly rollup"""
+    __tablename__ = 'points_transactions_archive'
+    
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)  # id from points_transactions
+    student_id = db.Column(db.Integer, nullable=False, index=True)
+    points = db.Column(db.Integer, nullable=False)
+    transaction_type = db.Column(db.String(20), nullable=False)
+    description = db.Column(db.String(200))
+    question_id = db.Column(db.Integer)
+    created_at = db.Column(db.DateTime)
+    archived_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+class PointsMonthlySummary(db.Model):
+    """Per-student monthly totals standing in for archived transactions"""
+    __tablename__ = 'points_monthly_summaries'
+    __table_args__ = (
+        db.UniqueConstraint('student_id', 'month', 'transaction_type', name='uq_points_summary_month'),
+        db.Index('ix_points_summaries_student_created', 'student_id', 'created_at'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    student_id = db.Column(db.Integer, db.ForeignKey('students.id'), nullable=False)
+    month = db.Column(db.Date, nullable=False)  # first day of the month
+    transaction_type = db.Column(db.String(20), nullable=False)
+    points = db.Column(db.Integer, nullable=False, default=0)
+    transaction_count = db.Column(db.Integer, nullable=False, default=0)
+    created_at = db.Column(db.DateTime, nullable=False)  # last instant of the month, for ordering
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'points': self.points,
+            'transaction_type': self.transaction_type,
+            'description': f"{self.transaction_count} {self.transaction_type} transactions in {self.month.strftime('%B %Y')}",
+            'created_at': self.created_at.isoformat(),
+            'summary': True
+        }
+
+
 class RedemptionRequest(db.Model):
     __tablename__ = 'redemption_requests'
+    __table_args__ = (
+        db.UniqueConstraint('student_id', 'idempotency_key', name='uq_redemption_idempotency_key'),
+        db.Index('ix_redemption_requests_student_created', 'student_id', 'created_at'),
+        db.Index('ix_redemption_requests_status_created', 'status', 'created_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     student_id = db.Column(db.Integer, db.ForeignKey('students.id'), nullable=False)
     points_redeemed = db.Column(db.Integer, nullable=False)
     redemption_type = db.Column(db.String(50), nullable=False)  # 'gift_card' or 'upi'
     upi_id = db.Column(db.String(100))
-    status = db.Column(db.String(20), default='pending')  # pending, approved, rejected
+    idempotency_key = db.Column(db.String(64))  # client-chosen, makes retries safe
+    status = db.Column(db.String(20), default='pending')  # pending, processing, approved, rejected, payout_unknown
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     processed_at = db.Column(db.DateTime)
     
+    # Set by the redemption processor
+    claim_token = db.Column(db.String(32))
+    claimed_at = db.Column(db.DateTime)
+    payout_reference = db.Column(db.String(100))
+    failure_reason = db.Column(db.String(200))
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -6,6 +6,7 @@ class Question(db.Model):
     __tablename__ = 'questions'
     
     id = db.Column(db.Integer, primary_key=True)
+    external_id = db.Column(db.String(64), unique=True)  # natural key for imports
     question_text = db.Column(db.Text, nullable=False)
     question_type = db.Column(db.String(20), nullable=False)  # 'mcq' or 'speaking'
     difficulty = db.Column(db.String(20), default='easy')  # easy, medium, hard
@@ -22,6 +23,7 @@ class Question(db.Model):
     expected_keywords = db.Column(db.Text)  # JSON string of keywords
     
     is_active = db.Column(db.Boolean, default=True)
+    import_batch = db.Column(db.String(32))  # id of the import that last wrote the row
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     def to_dict(self):
@@ -44,4 +46,26 @@ class Question(db.Model):
         return result
 
 
- 
\ No newline at end of file
+class QuestionBankVersion(db.Model):
+    """Single-row version stamp bumped whenever questions are added or deactivated"""
+    __tablename__ = 'question_bank_version'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    
+    @classmethod
+    def current(cls):
+        return db.session.query(cls.version).filter_by(id=1).scalar() or 0
+
+
+class AnsweredQuestion(db.Model):
+    """Questions a student has answered correctly at least once"""
+    __tablename__ = 'answered_questions'
+    __table_args__ = (
+        db.UniqueConstraint('student_id', 'question_id', name='uq_answered_student_question'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    student_id = db.Column(db.Integer, db.ForeignKey('students.id'), nullable=False)
+    question_id = db.Column(db.Integer, db.ForeignKey('questions.id'), nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
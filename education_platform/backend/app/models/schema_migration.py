@@ -0,0 +1,10 @@
+# backend/app/models/schema_migration.py
+from . import db
+from datetime import datetime
+
+class SchemaMigration(db.Model):
+    """Data migrations that have completed, so an interrupted one is retried on the next start"""
+    __tablename__ = 'schema_migrations'
+    
+    name = db.Column(db.String(100), primary_key=True)
+    applied_at = db.Column(db.DateTime, default=datetime.utcnow)
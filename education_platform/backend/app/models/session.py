@@ -3,6 +3,11 @@ from datetime import datetime
 
 class VideoSession(db.Model):
     __tablename__ = 'video_sessions'
+    __table_args__ = (
+        db.Index('ix_video_sessions_student_created', 'student_id', 'created_at'),
+        db.Index('ix_video_sessions_teacher_created', 'teacher_id', 'created_at'),
+        db.Index('ix_video_sessions_teacher_start', 'teacher_id', 'start_time'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     student_id = db.Column(db.Integer, db.ForeignKey('students.id'), nullable=False)
@@ -11,7 +16,8 @@ class VideoSession(db.Model):
     start_time = db.Column(db.DateTime, default=datetime.utcnow)
     end_time = db.Column(db.DateTime)
     duration = db.Column(db.Integer)  # in seconds
-    status = db.Column(db.String(20), default='active')  # active, completed, terminated
+    status = db.Column(db.String(20), default='active', index=True)  # active, completed, terminated
+    worker_id = db.Column(db.String(32))  # server process holding the call, see StateBackend.worker_id
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     def to_dict(self):
@@ -15,6 +15,7 @@ class Student(db.Model):
     points_balance = db.Column(db.Integer, default=0)
     total_video_time = db.Column(db.Integer, default=0)  # in seconds
     training_progress = db.Column(db.Integer, default=0)  # percentage
+    questions_answered = db.Column(db.Integer, default=0)  # distinct questions answered correctly
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     # Relationships
@@ -32,5 +33,6 @@ class Student(db.Model):
             'mobile': self.mobile,
             'points_balance': self.points_balance,
             'total_video_time': self.total_video_time,
-            'training_progress': self.training_progress
+            'training_progress': self.training_progress,
+            'questions_answered': self.questions_answered
         }
\ No newline at end of file
@@ -1,7 +1,8 @@
 # backend/app/models/user.py
 from . import db
 from datetime import datetime
-from werkzeug.security import generate_password_hash, check_password_hash
+from sqlalchemy.orm import validates
+from ..services.password_service import password_hasher
 class User(db.Model):
     __tablename__ = 'users'
     
@@ -12,16 +13,37 @@ class User(db.Model):
     is_active = db.Column(db.Boolean, default=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    tokens_valid_after = db.Column(db.DateTime, index=True)  # tokens issued earlier are rejected
     
     # Relationships
     student_profile = db.relationship('Student', backref='user', uselist=False, cascade='all, delete-orphan')
     teacher_profile = db.relationship('Teacher', backref='user', uselist=False, cascade='all, delete-orphan')
     
+    @validates('is_active', 'role')
+    def _revoke_on_change(self, key, value):
+        # Deactivation and role changes invalidate the claims in existing tokens
+        if self.id is not None and getattr(self, key) != value:
+            self.revoke_tokens()
+        return value
+    
+    def revoke_tokens(self):
+        self.tokens_valid_after = datetime.utcnow()
+    
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = password_hasher.hash(password)
     
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        return password_hasher.verify(self.password_hash, password)
+    
+    def rehash_password_if_needed(self, password):
+        """Upgrade an outdated hash after a successful login"""
+        if not password_hasher.needs_rehash(self.password_hash):
+            return False
+        User.query.filter_by(id=self.id).update({
+            'password_hash': password_hasher.hash(password)
+        }, synchronize_session=False)
+        db.session.commit()
+        return True
     
     def to_dict(self):
         return {
@@ -0,0 +1,69 @@
+# backend/app/routes/admin.py
+import io
+from flask import Blueprint, Response, request, jsonify, stream_with_context
+from ..services.onboarding_service import read_rows, import_users
+from ..services.question_bank_service import import_questions, export_questions
+from ..utils.decorators import admin_required
+
+bp = Blueprint('admin', __name__, url_prefix='/api/admin')
+
+def upload_stream():
+    """Text stream over an uploaded 'file' field, or over the raw request body"""
+    upload = request.files.get('file')
+    raw = upload.stream if upload else request.stream
+    return io.TextIOWrapper(raw, encoding='utf-8-sig', newline='')
+
+
+@bp.route('/users/import', methods=['POST'])
+@admin_required
+def import_users_endpoint():
+    try:
+        role = request.args.get('role', 'student')
+        fmt = request.args.get('format', 'csv')
+        
+        if role not in ['student', 'teacher']:
+            return jsonify({'error': 'Invalid role'}), 400
+        
+        if fmt not in ['csv', 'jsonl']:
+            return jsonify({'error': 'Invalid format'}), 400
+        
+        report = import_users(read_rows(upload_stream(), fmt), role)
+        
+        return jsonify(report), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@bp.route('/questions/import', methods=['POST'])
+@admin_required
+def import_questions_endpoint():
+    try:
+        fmt = request.args.get('format', 'jsonl')
+        deactivate_missing = request.args.get('deactivate_missing', 'false').lower() == 'true'
+        
+        if fmt not in ['csv', 'jsonl']:
+            return jsonify({'error': 'Invalid format'}), 400
+        
+        report = import_questions(read_rows(upload_stream(), fmt), deactivate_missing=deactivate_missing)
+        
+        return jsonify(report), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@bp.route('/questions/export', methods=['GET'])
+@admin_required
+def export_questions_endpoint():
+    fmt = request.args.get('format', 'jsonl')
+    
+    if fmt not in ['csv', 'jsonl']:
+        return jsonify({'error': 'Invalid format'}), 400
+    
+    mimetype = 'text/csv' if fmt == 'csv' else 'application/x-ndjson'
+    return Response(
+        stream_with_context(export_questions(fmt)),
+        mimetype=mimetype,
+        headers={'Content-Disposition': f'attachment; filename=questions.{fmt}'}
+    )
@@ -1,11 +1,13 @@
 # backend/app/routes/auth.py
 from flask import Blueprint, request, jsonify, render_template
-from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required
 from ..models import db
 from ..models.user import User
 from ..models.student import Student
 from ..models.teacher import Teacher
 from ..utils.validators import validate_email, validate_password, validate_mobile
+from ..utils.identity import current_user
+from ..services.auth_service import create_user_token
 
 bp = Blueprint('auth', __name__, url_prefix='/api/auth')
 
@@ -54,7 +56,7 @@ def student_signup():
         db.session.commit()
         
         # Create token
-        access_token = create_access_token(identity=user.id)
+        access_token = create_user_token(user, student)
         
         return jsonify({
             'message': 'Student registered successfully',
@@ -111,7 +113,7 @@ def teacher_signup():
         db.session.commit()
         
         # Create token
-        access_token = create_access_token(identity=user.id)
+        access_token = create_user_token(user, teacher)
         
         return jsonify({
             'message': 'Teacher registered successfully',
@@ -141,13 +143,16 @@ def student_login():
         if not user.is_active:
             return jsonify({'error': 'Account is deactivated'}), 403
         
-        access_token = create_access_token(identity=user.id)
+        user.rehash_password_if_needed(data['password'])
+        
+        profile = user.student_profile
+        access_token = create_user_token(user, profile)
         
         return jsonify({
             'message': 'Login successful',
             'access_token': access_token,
             'user': user.to_dict(),
-            'profile': user.student_profile.to_dict()
+            'profile': profile.to_dict()
         }), 200
         
     except Exception as e:
@@ -170,13 +175,16 @@ def teacher_login():
         if not user.is_active:
             return jsonify({'error': 'Account is deactivated'}), 403
         
-        access_token = create_access_token(identity=user.id)
+        user.rehash_password_if_needed(data['password'])
+        
+        profile = user.teacher_profile
+        access_token = create_user_token(user, profile)
         
         return jsonify({
             'message': 'Login successful',
             'access_token': access_token,
             'user': user.to_dict(),
-            'profile': user.teacher_profile.to_dict()
+            'profile': profile.to_dict()
         }), 200
         
     except Exception as e:
@@ -187,8 +195,7 @@ def teacher_login():
 @jwt_required()
 def get_current_user():
     try:
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+        user = current_user
         
         if not user:
             return jsonify({'error': 'User not found'}), 404
@@ -0,0 +1,82 @@
+# backend/app/routes/leaderboard.py
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required
+from ..models import db
+from ..models.student import Student
+from ..utils.identity import current_student
+from ..utils.decorators import student_required
+from ..services.leaderboard_service import leaderboard, WINDOWS
+
+bp = Blueprint('leaderboard', __name__, url_prefix='/api/leaderboard')
+
+MAX_TOP = 100
+MAX_RADIUS = 25
+
+
+def with_names(entries):
+    """Attach student names with one IN query for the page of entries"""
+    ids = [entry['student_id'] for entry in entries]
+    names = dict(db.session.query(Student.id, Student.name).filter(Student.id.in_(ids))) if ids else {}
+    for entry in entries:
+        entry['name'] = names.get(entry['student_id'])
+    return entries
+
+
+def window_arg():
+    window = request.args.get('window', 'global')
+    return window if window in WINDOWS else None
+
+
+@bp.route('/top', methods=['GET'])
+@jwt_required()
+def get_top():
+    try:
+        window = window_arg()
+        if not window:
+            return jsonify({'error': 'Invalid window'}), 400
+        
+        limit = max(1, min(request.args.get('limit', MAX_TOP, type=int), MAX_TOP))
+        
+        return jsonify({
+            'window': window,
+            'leaders': with_names(leaderboard.top(window, limit))
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@bp.route('/me', methods=['GET'])
+@student_required
+def get_my_rank():
+    try:
+        window = window_arg()
+        if not window:
+            return jsonify({'error': 'Invalid window'}), 400
+        
+        return jsonify({
+            'window': window,
+            **leaderboard.rank(window, current_student.id)
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@bp.route('/around-me', methods=['GET'])
+@student_required
+def get_around_me():
+    try:
+        window = window_arg()
+        if not window:
+            return jsonify({'error': 'Invalid window'}), 400
+        
+        radius = max(1, min(request.args.get('radius', 5, type=int), MAX_RADIUS))
+        
+        return jsonify({
+            'window': window,
+            'neighbours': with_names(leaderboard.around(window, current_student.id, radius))
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
@@ -0,0 +1,14 @@
+# backend/app/routes/metrics.py
+from flask import Blueprint, jsonify, Response
+from ..services.metrics_service import metrics
+
+bp = Blueprint('metrics', __name__, url_prefix='/api/metrics')
+
+@bp.route('', methods=['GET'])
+def get_metrics():
+    return jsonify(metrics.snapshot()), 200
+
+
+@bp.route('/prometheus', methods=['GET'])
+def get_prometheus_metrics():
+    return Response(metrics.prometheus(), mimetype='text/plain; version=0.0.4')
@@ -1,11 +1,14 @@
 # backend/app/routes/points.py
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from sqlalchemy.exc import IntegrityError
 from ..models import db
-from ..models.user import User
 from ..models.student import Student
-from ..models.points import PointsTransaction, RedemptionRequest
+from ..models.points import PointsTransaction, PointsMonthlySummary, RedemptionRequest
+from ..utils.identity import current_student
 from ..utils.decorators import student_required
+from ..services.counter_service import decrement_if_available
+from ..services.leaderboard_service import leaderboard
+from ..utils.pagination import keyset_page, merged_keyset_page, InvalidCursor
 
 bp = Blueprint('points', __name__, url_prefix='/api/points')
 
@@ -13,9 +16,7 @@ bp = Blueprint('points', __name__, url_prefix='/api/points')
 @student_required
 def get_balance():
     try:
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
-        student = user.student_profile
+        student = current_student
         
         return jsonify({
             'points_balance': student.points_balance
@@ -29,55 +30,72 @@ def get_balance():
 @student_required
 def get_history():
     try:
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
-        student = user.student_profile
+        student = current_student
         
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 20, type=int)
-        
-        transactions = PointsTransaction.query.filter_by(student_id=student.id)\
-            .order_by(PointsTransaction.created_at.desc())\
-            .paginate(page=page, per_page=per_page, error_out=False)
+        # Recent transactions first, then monthly summaries of rolled-up ones
+        page = merged_keyset_page([
+            (PointsTransaction.query.filter_by(student_id=student.id), PointsTransaction),
+            (PointsMonthlySummary.query.filter_by(student_id=student.id), PointsMonthlySummary)
+        ], cache_key=('points_history', student.id))
         
         return jsonify({
-            'transactions': [t.to_dict() for t in transactions.items],
-            'total': transactions.total,
-            'pages': transactions.pages,
-            'current_page': page
+            'transactions': [t.to_dict() for t in page.pop('items')],
+            **page
         }), 200
         
+    except InvalidCursor as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
+def redemption_replay(student, redemption):
+    balance = db.session.query(Student.points_balance).filter_by(id=student.id).scalar()
+    return jsonify({
+        'message': 'Redemption request submitted successfully',
+        'remaining_balance': balance,
+        'redemption': redemption.to_dict()
+    }), 200
+
+
 @bp.route('/redeem', methods=['POST'])
 @student_required
 def redeem_points():
     try:
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
-        student = user.student_profile
+        student = current_student
         
         data = request.get_json()
         points = data.get('points', 0)
         redemption_type = data.get('type')  # 'gift_card' or 'upi'
         upi_id = data.get('upi_id')
+        idempotency_key = request.headers.get('Idempotency-Key') or data.get('idempotency_key') or None
+        
+        if idempotency_key is not None and (not isinstance(idempotency_key, str) or len(idempotency_key) > 64):
+            return jsonify({'error': 'Idempotency key must be a string of at most 64 characters'}), 400
+        
+        # A retried request returns the redemption it already created
+        if idempotency_key:
+            existing = RedemptionRequest.query.filter_by(
+                student_id=student.id,
+                idempotency_key=idempotency_key
+            ).first()
+            if existing:
+                return redemption_replay(student, existing)
         
         if points <= 0:
             return jsonify({'error': 'Invalid points amount'}), 400
         
-        if points > student.points_balance:
-            return jsonify({'error': 'Insufficient points'}), 400
-        
         if redemption_type not in ['gift_card', 'upi']:
             return jsonify({'error': 'Invalid redemption type'}), 400
         
         if redemption_type == 'upi' and not upi_id:
             return jsonify({'error': 'UPI ID required for UPI redemption'}), 400
         
-        # Deduct points
-        student.points_balance -= points
+        # Deduct points only if the balance still covers them
+        remaining_balance = decrement_if_available(Student, 'points_balance', student.id, points)
+        if remaining_balance is None:
+            db.session.rollback()
+            return jsonify({'error': 'Insufficient points'}), 400
         
         # Create transaction
         transaction = PointsTransaction(
@@ -93,15 +111,29 @@ def redeem_points():
             student_id=student.id,
             points_redeemed=points,
             redemption_type=redemption_type,
-            upi_id=upi_id
+            upi_id=upi_id,
+            idempotency_key=idempotency_key
         )
         db.session.add(redemption)
         
-        db.session.commit()
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # A concurrent retry with the same key won; this debit is rolled back
+            db.session.rollback()
+            if not idempotency_key:
+                raise
+            existing = RedemptionRequest.query.filter_by(
+                student_id=student.id,
+                idempotency_key=idempotency_key
+            ).first()
+            return redemption_replay(student, existing)
+        
+        leaderboard.set_balance(student.id, remaining_balance)
         
         return jsonify({
             'message': 'Redemption request submitted successfully',
-            'remaining_balance': student.points_balance,
+            'remaining_balance': remaining_balance,
             'redemption': redemption.to_dict()
         }), 201
         
@@ -114,17 +146,20 @@ def redeem_points():
 @student_required
 def get_redemptions():
     try:
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
-        student = user.student_profile
+        student = current_student
         
-        redemptions = RedemptionRequest.query.filter_by(student_id=student.id)\
-            .order_by(RedemptionRequest.created_at.desc())\
-            .all()
+        page = keyset_page(
+            RedemptionRequest.query.filter_by(student_id=student.id),
+            RedemptionRequest,
+            cache_key=('redemptions', student.id)
+        )
         
         return jsonify({
-            'redemptions': [r.to_dict() for r in redemptions]
+            'redemptions': [r.to_dict() for r in page.pop('items')],
+            **page
         }), 200
         
+    except InvalidCursor as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
\ No newline at end of file
@@ -1,9 +1,7 @@
 # backend/app/routes/student.py
-from flask import Blueprint, request, jsonify, render_template
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask import Blueprint, request, jsonify
 from ..models import db
-from ..models.user import User
-from ..models.student import Student
+from ..utils.identity import current_student
 from ..utils.decorators import student_required
 
 bp = Blueprint('student', __name__, url_prefix='/api/student')
@@ -12,9 +10,7 @@ bp = Blueprint('student', __name__, url_prefix='/api/student')
 @student_required
 def get_profile():
     try:
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
-        student = user.student_profile
+        student = current_student
         
         return jsonify({
             'profile': student.to_dict()
@@ -28,9 +24,7 @@ def get_profile():
 @student_required
 def update_profile():
     try:
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
-        student = user.student_profile
+        student = current_student
         
         data = request.get_json()
         
@@ -62,9 +56,7 @@ def update_profile():
 @student_required
 def get_dashboard_stats():
     try:
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
-        student = user.student_profile
+        student = current_student
         
         from ..models.session import VideoSession
         total_sessions = VideoSession.query.filter_by(student_id=student.id).count()
@@ -1,10 +1,9 @@
 # backend/app/routes/teacher.py
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
 from ..models import db
-from ..models.user import User
-from ..models.teacher import Teacher
+from ..utils.identity import current_teacher
 from ..utils.decorators import teacher_required
+from ..utils.pagination import keyset_page, InvalidCursor
 
 bp = Blueprint('teacher', __name__, url_prefix='/api/teacher')
 
@@ -12,9 +11,7 @@ bp = Blueprint('teacher', __name__, url_prefix='/api/teacher')
 @teacher_required
 def get_profile():
     try:
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
-        teacher = user.teacher_profile
+        teacher = current_teacher
         
         return jsonify({
             'profile': teacher.to_dict()
@@ -28,9 +25,7 @@ def get_profile():
 @teacher_required
 def update_profile():
     try:
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
-        teacher = user.teacher_profile
+        teacher = current_teacher
         
         data = request.get_json()
         
@@ -64,12 +59,10 @@ def update_profile():
 @teacher_required
 def get_dashboard_stats():
     try:
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
-        teacher = user.teacher_profile
+        teacher = current_teacher
         
         from ..models.session import VideoSession
-        from datetime import datetime, timedelta
+        from datetime import datetime
         
         total_sessions = VideoSession.query.filter_by(teacher_id=teacher.id).count()
         
@@ -97,9 +90,7 @@ def get_dashboard_stats():
 @teacher_required
 def toggle_availability():
     try:
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
-        teacher = user.teacher_profile
+        teacher = current_teacher
         
         teacher.is_available = not teacher.is_available
         db.session.commit()
@@ -118,25 +109,22 @@ def toggle_availability():
 @teacher_required
 def get_session_history():
     try:
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
-        teacher = user.teacher_profile
+        teacher = current_teacher
         
         from ..models.session import VideoSession
         
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 20, type=int)
-        
-        sessions = VideoSession.query.filter_by(teacher_id=teacher.id)\
-            .order_by(VideoSession.created_at.desc())\
-            .paginate(page=page, per_page=per_page, error_out=False)
+        page = keyset_page(
+            VideoSession.query.filter_by(teacher_id=teacher.id),
+            VideoSession,
+            cache_key=('teacher_sessions', teacher.id)
+        )
         
         return jsonify({
-            'sessions': [s.to_dict() for s in sessions.items],
-            'total': sessions.total,
-            'pages': sessions.pages,
-            'current_page': page
+            'sessions': [s.to_dict() for s in page.pop('items')],
+            **page
         }), 200
         
+    except InvalidCursor as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
\ No newline at end of file
@@ -1,16 +1,31 @@
 # backend/app/routes/training.py
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from sqlalchemy import insert
 from ..models import db
-from ..models.user import User
 from ..models.question import Question
 from ..models.student import Student
 from ..models.points import PointsTransaction
+from ..utils.identity import current_student
 from ..utils.decorators import student_required
-import random
+from ..services.counter_service import increment
+from ..services.question_cache import question_cache
+from ..services.scoring_service import keyword_scorer
+from ..services.practice_service import practice_queues
+from ..services.leaderboard_service import leaderboard
+from ..services.progress_service import record_correct_answer, record_correct_answers
 
 bp = Blueprint('training', __name__, url_prefix='/api/training')
 
+MAX_ANSWERS_PER_SUBMISSION = 50
+
+
+def grade_answer(question, answer):
+    if question.question_type == 'mcq':
+        return str(answer).upper() == question.correct_answer
+    # Speaking answers arrive as transcripts and are graded on expected keywords
+    return keyword_scorer.grade(question, str(answer))
+
+
 @bp.route('/questions', methods=['GET'])
 @student_required
 def get_questions():
@@ -19,18 +34,15 @@ def get_questions():
         question_type = request.args.get('type', 'mcq')
         count = request.args.get('count', 5, type=int)
         
-        questions = Question.query.filter_by(
-            difficulty=difficulty,
-            question_type=question_type,
-            is_active=True
-        ).all()
-        
-        # Randomly select questions
-        if len(questions) > count:
-            questions = random.sample(questions, count)
+        # Next questions from the student's practice queue; while the queue is
+        # still being filled, or once every question has been answered
+        # correctly, fall back to random review
+        questions = practice_queues.next_questions(current_student.id, difficulty, question_type, count)
+        if not questions:
+            questions = question_cache.sample(difficulty, question_type, count)
         
         return jsonify({
-            'questions': [q.to_dict() for q in questions]
+            'questions': questions
         }), 200
         
     except Exception as e:
@@ -41,9 +53,7 @@ def get_questions():
 @student_required
 def submit_answer():
     try:
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
-        student = user.student_profile
+        student = current_student
         
         data = request.get_json()
         question_id = data.get('question_id')
@@ -58,17 +68,15 @@ def submit_answer():
         
         is_correct = False
         points_earned = 0
+        total_points = student.points_balance
+        training_progress = student.training_progress
         
-        if question.question_type == 'mcq':
-            is_correct = answer.upper() == question.correct_answer
-        else:
-            # For speaking prompts, we'll accept any answer for now
-            # In production, you'd integrate speech recognition
-            is_correct = True
+        is_correct = grade_answer(question, answer)
+        practice_queues.record_result(student.id, question, is_correct)
         
         if is_correct:
             points_earned = question.points_value
-            student.points_balance += points_earned
+            total_points = increment(Student, 'points_balance', student.id, points_earned)
             
             # Create points transaction
             transaction = PointsTransaction(
@@ -80,21 +88,20 @@ def submit_answer():
             )
             db.session.add(transaction)
             
-            # Update training progress
-            total_questions = Question.query.filter_by(is_active=True).count()
-            answered = PointsTransaction.query.filter_by(
-                student_id=student.id,
-                transaction_type='earned'
-            ).count()
-            student.training_progress = min(100, int((answered / total_questions) * 100))
+            # Update training progress (repeat answers do not count twice)
+            training_progress = record_correct_answer(student, question.id)
         
         db.session.commit()
         
+        if is_correct:
+            leaderboard.set_balance(student.id, total_points)
+            leaderboard.add_weekly(student.id, points_earned)
+        
         return jsonify({
             'is_correct': is_correct,
             'points_earned': points_earned,
-            'total_points': student.points_balance,
-            'training_progress': student.training_progress
+            'total_points': total_points,
+            'training_progress': training_progress
         }), 200
         
     except Exception as e:
@@ -102,4 +109,80 @@ def submit_answer():
         return jsonify({'error': str(e)}), 500
 
 
- 
\ No newline at end of file
+@bp.route('/submit-answers', methods=['POST'])
+@student_required
+def submit_answers():
+    """Grade a whole round: one question lookup, one insert, one balance update, one commit"""
+    try:
+        student = current_student
+        
+        data = request.get_json() or {}
+        answers = data.get('answers')
+        
+        if not isinstance(answers, list) or not answers:
+            return jsonify({'error': 'Answers required'}), 400
+        if len(answers) > MAX_ANSWERS_PER_SUBMISSION:
+            return jsonify({'error': f'At most {MAX_ANSWERS_PER_SUBMISSION} answers per submission'}), 400
+        if not all(isinstance(item, dict) and item.get('question_id') and item.get('answer') for item in answers):
+            return jsonify({'error': 'Question ID and answer required'}), 400
+        if not all(type(item['question_id']) is int for item in answers):
+            return jsonify({'error': 'Question ID must be an integer'}), 400
+        
+        question_ids = {item['question_id'] for item in answers}
+        if len(question_ids) != len(answers):
+            return jsonify({'error': 'Each question may only be answered once per submission'}), 400
+        questions = {
+            q.id: q for q in Question.query.filter(Question.id.in_(question_ids))
+        }
+        
+        results = []
+        transactions = []
+        for item in answers:
+            question = questions.get(item['question_id'])
+            if not question:
+                results.append({'question_id': item['question_id'], 'error': 'Question not found'})
+                continue
+            
+            is_correct = grade_answer(question, item['answer'])
+            practice_queues.record_result(student.id, question, is_correct)
+            points_earned = question.points_value if is_correct else 0
+            results.append({
+                'question_id': question.id,
+                'is_correct': is_correct,
+                'points_earned': points_earned
+            })
+            if is_correct:
+                transactions.append({
+                    'student_id': student.id,
+                    'points': points_earned,
+                    'transaction_type': 'earned',
+                    'description': f'Answered {question.difficulty} question',
+                    'question_id': question.id
+                })
+        
+        total_earned = sum(t['points'] for t in transactions)
+        # Read before the commit expires the student, so the response needs no reload
+        total_points = student.points_balance
+        training_progress = student.training_progress
+        if transactions:
+            db.session.execute(insert(PointsTransaction), transactions)
+            total_points = increment(Student, 'points_balance', student.id, total_earned)
+            training_progress = record_correct_answers(student, [t['question_id'] for t in transactions])
+        
+        db.session.commit()
+        
+        if transactions:
+            leaderboard.set_balance(student.id, total_points)
+            leaderboard.add_weekly(student.id, total_earned)
+        
+        return jsonify({
+            'results': results,
+            'correct_count': len(transactions),
+            'points_earned': total_earned,
+            'total_points': total_points,
+            'training_progress': training_progress
+        }), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
@@ -1,14 +1,9 @@
 # backend/app/routes/video.py
-from flask import Blueprint, request, jsonify, render_template
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from ..models import db
-from ..models.user import User
+from flask import Blueprint, jsonify
+from flask_jwt_extended import jwt_required
 from ..models.session import VideoSession
-from ..models.student import Student
-from ..models.teacher import Teacher
-from ..utils.decorators import student_required, teacher_required
-from datetime import datetime
-import uuid
+from ..utils.identity import current_user
+from ..utils.pagination import keyset_page, InvalidCursor
 
 bp = Blueprint('video', __name__, url_prefix='/api/video')
 
@@ -16,22 +11,28 @@ bp = Blueprint('video', __name__, url_prefix='/api/video')
 @jwt_required()
 def get_sessions():
     try:
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+        user = current_user
+        if not user:
+            return jsonify({'error': 'User not found'}), 404
         
         if user.role == 'student':
             student = user.student_profile
-            sessions = VideoSession.query.filter_by(student_id=student.id)\
-                .order_by(VideoSession.created_at.desc()).limit(20).all()
+            query = VideoSession.query.filter_by(student_id=student.id)
+            cache_key = ('student_sessions', student.id)
         else:
             teacher = user.teacher_profile
-            sessions = VideoSession.query.filter_by(teacher_id=teacher.id)\
-                .order_by(VideoSession.created_at.desc()).limit(20).all()
+            query = VideoSession.query.filter_by(teacher_id=teacher.id)
+            cache_key = ('teacher_sessions', teacher.id)
+        
+        page = keyset_page(query, VideoSession, cache_key=cache_key)
         
         return jsonify({
-            'sessions': [s.to_dict() for s in sessions]
+            'sessions': [s.to_dict() for s in page.pop('items')],
+            **page
         }), 200
         
+    except InvalidCursor as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -0,0 +1,166 @@
+# backend/app/schema.py
+from datetime import datetime
+from sqlalchemy import inspect, select, update, func, literal, case, union, true, UniqueConstraint
+from .models import db
+from .models.schema_migration import SchemaMigration
+
+# db.create_all() only creates missing tables. upgrade_schema() brings an
+# existing database up to the models: it adds columns, indexes and unique
+# constraints introduced since the tables were created, and runs data backfills
+# not yet recorded in schema_migrations. Every step is idempotent; create_app
+# runs it at startup and `flask upgrade-db` runs it (with a full backfill) on demand.
+
+
+def _column_ddl(column, dialect):
+    ddl = f'{column.name} {column.type.compile(dialect=dialect)}'
+    default = column.default
+    if default is not None and default.is_scalar:
+        value = literal(default.arg).compile(dialect=dialect, compile_kwargs={'literal_binds': True})
+        ddl += f' DEFAULT {value}'
+    return ddl
+
+
+def add_missing_columns():
+    """ALTER TABLE ... ADD COLUMN for model columns missing from existing tables"""
+    engine = db.engine
+    inspector = inspect(engine)
+    tables = set(inspector.get_table_names())
+    added = []
+    for table in db.metadata.sorted_tables:
+        if table.name not in tables:
+            continue
+        present = {column['name'] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in present:
+                continue
+            try:
+                with engine.begin() as conn:
+                    conn.exec_driver_sql(
+                        f'ALTER TABLE {table.name} ADD COLUMN {_column_ddl(column, engine.dialect)}')
+                added.append(f'{table.name}.{column.name}')
+            except Exception:
+                # Another worker starting at the same time may have added it first
+                present = {c['name'] for c in inspect(engine).get_columns(table.name)}
+                if column.name not in present:
+                    raise
+    return added
+
+
+def create_missing_unique_constraints():
+    """Unique constraints declared on the models, created as unique indexes on existing tables"""
+    engine = db.engine
+    inspector = inspect(engine)
+    tables = set(inspector.get_table_names())
+    created = []
+    for table in db.metadata.sorted_tables:
+        if table.name not in tables:
+            continue
+        present = {tuple(c['column_names']) for c in inspector.get_unique_constraints(table.name)}
+        present |= {tuple(i['column_names']) for i in inspector.get_indexes(table.name) if i['unique']}
+        for constraint in table.constraints:
+            if not isinstance(constraint, UniqueConstraint):
+                continue
+            columns = tuple(column.name for column in constraint.columns)
+            if columns in present:
+                continue
+            name = constraint.name or f"uq_{table.name}_{'_'.join(columns)}"
+            try:
+                with engine.begin() as conn:
+                    conn.exec_driver_sql(
+                        f"CREATE UNIQUE INDEX IF NOT EXISTS {name} ON {table.name} ({', '.join(columns)})")
+                created.append(name)
+            except Exception as e:
+                # Usually duplicate rows that predate the constraint; they must be cleaned up by hand
+                print(f'Could not create unique index {name}: {str(e)}')
+    return created
+
+
+def create_missing_indexes():
+    """CREATE INDEX IF NOT EXISTS for every model index, e.g. the keyset pagination indexes"""
+    engine = db.engine
+    inspector = inspect(engine)
+    tables = set(inspector.get_table_names())
+    created = []
+    for table in db.metadata.sorted_tables:
+        if table.name not in tables:
+            continue
+        present = {index['name'] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name in present:
+                continue
+            index.create(engine, checkfirst=True)
+            created.append(index.name)
+    return created
+
+
+def backfill_training_progress():
+    """Rebuild answered_questions, questions_answered and training_progress from earned transactions"""
+    from .models.points import PointsTransaction, PointsTransactionArchive
+    from .models.question import Question, AnsweredQuestion
+    from .models.student import Student
+    from .utils.sql import dialect_insert
+    
+    earned = union(*[
+        select(model.student_id, model.question_id)
+        .where(model.transaction_type == 'earned', model.question_id.isnot(None))
+        for model in (PointsTransaction, PointsTransactionArchive)
+    ]).subquery()
+    # SQLite needs a WHERE on INSERT ... SELECT to parse the ON CONFLICT clause
+    inserted = db.session.execute(
+        dialect_insert(AnsweredQuestion.__table__)
+        .from_select(['student_id', 'question_id'],
+                     select(earned.c.student_id, earned.c.question_id).where(true()))
+        .on_conflict_do_nothing()
+    ).rowcount
+    
+    answered = (
+        select(func.count())
+        .select_from(AnsweredQuestion)
+        .where(AnsweredQuestion.student_id == Student.id)
+        .scalar_subquery()
+    )
+    total_questions = Question.query.filter_by(is_active=True).count()
+    progress = case((answered * 100 >= 100 * total_questions, 100),
+                    else_=answered * 100 // total_questions) if total_questions else 0
+    db.session.execute(
+        update(Student.__table__).values(questions_answered=answered, training_progress=progress)
+    )
+    db.session.commit()
+    return inserted
+
+
+# Backfills in the order they run; each is recorded once it has committed
+BACKFILLS = [
+    ('training_progress', lambda: f'backfilled {backfill_training_progress()} answered questions'),
+]
+
+
+def run_backfills(force=False):
+    """Run backfills missing from schema_migrations (all of them with force=True)"""
+    from .utils.sql import dialect_insert
+    
+    applied = {name for (name,) in db.session.query(SchemaMigration.name)}
+    changes = []
+    for name, backfill in BACKFILLS:
+        if name in applied and not force:
+            continue
+        changes.append(backfill())
+        db.session.execute(
+            dialect_insert(SchemaMigration.__table__)
+            .values(name=name, applied_at=datetime.utcnow())
+            .on_conflict_do_nothing()
+        )
+        db.session.commit()
+    return changes
+
+
+def upgrade_schema(backfill=False):
+    """Apply every upgrade step; returns a list of what changed.
+
+    Backfills run until they have completed once, or always with backfill=True.
+    """
+    changes = [f'added column {name}' for name in add_missing_columns()]
+    changes += [f'created unique index {name}' for name in create_missing_unique_constraints()]
+    changes += [f'created index {name}' for name in create_missing_indexes()]
+    changes += run_backfills(force=backfill)
+    return changes
@@ -0,0 +1,91 @@
+# backend/app/services/auth_service.py
+import threading
+import time
+from datetime import datetime, timezone
+from flask_jwt_extended import create_access_token
+from ..models import db
+from ..models.user import User
+
+
+def create_user_token(user, profile):
+    """Access token carrying role, profile id and active flag so authorization needs no DB lookup"""
+    claims = {
+        'role': user.role,
+        'is_active': user.is_active,
+        f'{user.role}_id': profile.id if profile else None
+    }
+    # PyJWT 2.10+ rejects non-string subjects; load_current_user converts it back
+    return create_access_token(identity=str(user.id), additional_claims=claims)
+
+
+def _timestamp(dt):
+    return dt.replace(tzinfo=timezone.utc).timestamp()
+
+
+class RevocationList:
+    """Users whose tokens issued before a given time must be rejected.
+
+    A background thread polls users.tokens_valid_after every
+    REVOCATION_REFRESH_SECONDS, so deactivations and role changes made through
+    the ORM (from any process) invalidate older tokens; other profile edits
+    leave tokens alone. Entries expire after JWT_ACCESS_TOKEN_EXPIRES,
+    when every token they could match has expired anyway.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._revoked = {}
+        self.app = None
+
+    def init_app(self, app, jwt):
+        self.app = app
+        self.ttl = app.config['JWT_ACCESS_TOKEN_EXPIRES'].total_seconds()
+        self.interval = app.config['REVOCATION_REFRESH_SECONDS']
+        self._since = time.time() - self.ttl
+        jwt.token_in_blocklist_loader(self._check_token)
+
+    def start(self):
+        """Start polling; called once the users table is up to date"""
+        thread = threading.Thread(target=self._run, name='revocation-refresh', daemon=True)
+        thread.start()
+
+    def revoke(self, user_id, at=None):
+        with self._lock:
+            self._revoked[str(user_id)] = at or time.time()
+
+    def is_revoked(self, jwt_payload):
+        # iat has one-second resolution; a token from the same second as the
+        # change is kept
+        revoked_at = self._revoked.get(str(jwt_payload['sub']))
+        return revoked_at is not None and jwt_payload['iat'] < int(revoked_at)
+
+    def _check_token(self, jwt_header, jwt_payload):
+        return self.is_revoked(jwt_payload)
+
+    def _run(self):
+        while True:
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f'Error refreshing revocations: {str(e)}')
+            time.sleep(self.interval)
+
+    def refresh(self):
+        since = datetime.fromtimestamp(self._since, tz=timezone.utc).replace(tzinfo=None)
+        with self.app.app_context():
+            rows = db.session.query(User.id, User.tokens_valid_after).filter(User.tokens_valid_after > since).all()
+            db.session.remove()
+
+        now = time.time()
+        with self._lock:
+            for user_id, valid_after in rows:
+                revoked_at = _timestamp(valid_after)
+                key = str(user_id)
+                self._revoked[key] = max(self._revoked.get(key, 0), revoked_at)
+                self._since = max(self._since, revoked_at)
+            expired = [key for key, at in self._revoked.items() if at < now - self.ttl]
+            for key in expired:
+                del self._revoked[key]
+
+
+revocations = RevocationList()
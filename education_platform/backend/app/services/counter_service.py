@@ -0,0 +1,51 @@
+# backend/app/services/counter_service.py
+from sqlalchemy import update, bindparam, func
+from ..models import db
+
+# Counters are changed with single UPDATE ... SET col = col + :delta statements
+# so concurrent requests never lose increments and no SELECT is needed first.
+
+
+def increment(model, column, row_id, delta):
+    """Add delta to one row's counter and return the new value (None if no such row)"""
+    table = model.__table__
+    col = table.c[column]
+    result = db.session.execute(
+        update(table)
+        .where(table.c.id == row_id)
+        .values({col: func.coalesce(col, 0) + delta})
+        .returning(col)
+    )
+    row = result.first()
+    return row[0] if row else None
+
+
+def decrement_if_available(model, column, row_id, amount):
+    """Subtract amount only if the counter holds at least that much.
+
+    Returns the new value, or None when the row is missing or the balance is too low.
+    """
+    table = model.__table__
+    col = table.c[column]
+    result = db.session.execute(
+        update(table)
+        .where(table.c.id == row_id, col >= amount)
+        .values({col: col - amount})
+        .returning(col)
+    )
+    row = result.first()
+    return row[0] if row else None
+
+
+def increment_many(model, column, deltas):
+    """Apply {row_id: delta} to a counter with one executemany UPDATE"""
+    if not deltas:
+        return
+    table = model.__table__
+    col = table.c[column]
+    stmt = (
+        update(table)
+        .where(table.c.id == bindparam('row_id'))
+        .values({col: func.coalesce(col, 0) + bindparam('delta')})
+    )
+    db.session.execute(stmt, [{'row_id': row_id, 'delta': delta} for row_id, delta in deltas.items()])
@@ -0,0 +1,268 @@
+# backend/app/services/leaderboard_service.py
+import threading
+import time
+from bisect import bisect_left, insort
+from datetime import datetime, timedelta
+from sqlalchemy import select, func
+from ..models import db
+from ..models.student import Student
+from ..models.points import PointsTransaction
+
+WINDOWS = ('global', 'weekly')
+_ID_BITS = 32
+_ID_MASK = (1 << _ID_BITS) - 1
+
+
+def _key(score, student_id):
+    # One int per entry: higher score first, then lower student id
+    return (-score << _ID_BITS) | student_id
+
+
+def _unkey(key):
+    return key & _ID_MASK, -(key >> _ID_BITS)
+
+
+def week_start(now=None):
+    now = now or datetime.utcnow()
+    return (now - timedelta(days=now.weekday())).replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+class RankedList:
+    """Sorted list of ints split into buckets of ~LOAD, with a Fenwick tree of bucket sizes.
+
+    Insert and remove are a bisect plus a short list memmove; rank (index)
+    and select (item at index) walk the Fenwick tree in O(log n).
+    """
+
+    LOAD = 1000
+
+    def __init__(self, sorted_keys=()):
+        sorted_keys = list(sorted_keys)
+        self._lists = [sorted_keys[i:i + self.LOAD] for i in range(0, len(sorted_keys), self.LOAD)]
+        self._len = len(sorted_keys)
+        self._reindex()
+
+    def _reindex(self):
+        self._maxes = [bucket[-1] for bucket in self._lists]
+        size = len(self._lists)
+        tree = [0] * (size + 1)
+        for i, bucket in enumerate(self._lists, start=1):
+            tree[i] += len(bucket)
+            parent = i + (i & -i)
+            if parent <= size:
+                tree[parent] += tree[i]
+        self._tree = tree
+
+    def _tree_add(self, bucket, delta):
+        i = bucket + 1
+        while i < len(self._tree):
+            self._tree[i] += delta
+            i += i & -i
+
+    def _prefix(self, bucket):
+        # Number of items in buckets before `bucket`
+        total = 0
+        i = bucket
+        while i > 0:
+            total += self._tree[i]
+            i -= i & -i
+        return total
+
+    def __len__(self):
+        return self._len
+
+    def add(self, key):
+        if not self._lists:
+            self._lists.append([key])
+            self._len = 1
+            self._reindex()
+            return
+        
+        bucket = min(bisect_left(self._maxes, key), len(self._lists) - 1)
+        insort(self._lists[bucket], key)
+        self._maxes[bucket] = self._lists[bucket][-1]
+        self._len += 1
+        
+        if len(self._lists[bucket]) > 2 * self.LOAD:
+            half = self._lists[bucket][self.LOAD:]
+            del self._lists[bucket][self.LOAD:]
+            self._lists.insert(bucket + 1, half)
+            self._reindex()
+        else:
+            self._tree_add(bucket, 1)
+
+    def remove(self, key):
+        bucket = bisect_left(self._maxes, key)
+        items = self._lists[bucket]
+        del items[bisect_left(items, key)]
+        self._len -= 1
+        
+        if items:
+            self._maxes[bucket] = items[-1]
+            self._tree_add(bucket, -1)
+        else:
+            del self._lists[bucket]
+            self._reindex()
+
+    def index(self, key):
+        """Position of key, which must be present"""
+        bucket = bisect_left(self._maxes, key)
+        return self._prefix(bucket) + bisect_left(self._lists[bucket], key)
+
+    def __getitem__(self, index):
+        # Fenwick descent to the bucket holding the index-th item
+        bucket = 0
+        step = 1 << (len(self._lists).bit_length())
+        while step:
+            nxt = bucket + step
+            if nxt < len(self._tree) and self._tree[nxt] <= index:
+                bucket = nxt
+                index -= self._tree[nxt]
+            step >>= 1
+        return self._lists[bucket][index]
+
+    def islice(self, start, stop):
+        """Items in positions [start, stop)"""
+        start, stop = max(0, start), min(stop, self._len)
+        return [self[i] for i in range(start, stop)]
+
+
+class Leaderboard:
+    """In-memory student rankings for the global balance and points earned this week.
+
+    Routes report new values after their commit (set_balance / add_weekly),
+    so updates cost O(log n) and no request sorts the students table. The
+    boards are rebuilt from the database at startup and every
+    LEADERBOARD_REBUILD_SECONDS, which also folds in changes made by other
+    worker processes. Balances set during a rebuild are replayed on top of
+    the new boards; weekly points earned in that window may lag until the
+    next rebuild.
+    """
+
+    def __init__(self):
+        self.app = None
+        self._lock = threading.RLock()
+        self._boards = {window: RankedList() for window in WINDOWS}
+        self._scores = {window: {} for window in WINDOWS}
+        self._week = week_start()
+        self._replay = None
+
+    def init_app(self, app):
+        self.app = app
+        self.rebuild_interval = app.config['LEADERBOARD_REBUILD_SECONDS']
+        thread = threading.Thread(target=self._run, name='leaderboard-rebuild', daemon=True)
+        thread.start()
+
+    def load(self, window, scores):
+        """Replace a board with {student_id: score}"""
+        scores = dict(scores)
+        board = RankedList(sorted(_key(score, student_id) for student_id, score in scores.items()))
+        with self._lock:
+            self._boards[window] = board
+            self._scores[window] = scores
+
+    def _set(self, window, student_id, score):
+        scores = self._scores[window]
+        board = self._boards[window]
+        old = scores.get(student_id)
+        if old == score:
+            return
+        if old is not None:
+            board.remove(_key(old, student_id))
+        board.add(_key(score, student_id))
+        scores[student_id] = score
+
+    def _roll_week(self):
+        current = week_start()
+        if current != self._week:
+            self._week = current
+            self._boards['weekly'] = RankedList()
+            self._scores['weekly'] = {}
+
+    def set_balance(self, student_id, balance):
+        with self._lock:
+            self._set('global', student_id, balance or 0)
+            if self._replay is not None:
+                self._replay.append((student_id, balance or 0))
+
+    def add_weekly(self, student_id, points):
+        with self._lock:
+            self._roll_week()
+            score = self._scores['weekly'].get(student_id, 0) + points
+            self._set('weekly', student_id, score)
+
+    def top(self, window, limit):
+        with self._lock:
+            if window == 'weekly':
+                self._roll_week()
+            return [self._entry(rank, key) for rank, key in
+                    enumerate(self._boards[window].islice(0, limit), start=1)]
+
+    def rank(self, window, student_id):
+        """{'rank', 'score', 'total'} for the student; rank is None when unranked"""
+        with self._lock:
+            if window == 'weekly':
+                self._roll_week()
+            board = self._boards[window]
+            score = self._scores[window].get(student_id)
+            if score is None:
+                return {'rank': None, 'score': 0, 'total': len(board)}
+            return {'rank': board.index(_key(score, student_id)) + 1, 'score': score, 'total': len(board)}
+
+    def around(self, window, student_id, radius):
+        """Entries from `radius` places above the student to `radius` below"""
+        with self._lock:
+            position = self.rank(window, student_id)['rank']
+            if position is None:
+                return []
+            start = max(0, position - 1 - radius)
+            keys = self._boards[window].islice(start, position + radius)
+            return [self._entry(rank, key) for rank, key in enumerate(keys, start=start + 1)]
+
+    def _entry(self, rank, key):
+        student_id, score = _unkey(key)
+        return {'rank': rank, 'student_id': student_id, 'score': score}
+
+    def rebuild(self):
+        """Reload both boards from the database in one streaming pass each"""
+        with self._lock:
+            self._replay = []
+        try:
+            since = week_start()
+            result = db.session.execute(
+                select(Student.id, func.coalesce(Student.points_balance, 0))
+                .execution_options(yield_per=10000)
+            )
+            balances = {student_id: balance for rows in result.partitions() for student_id, balance in rows}
+            
+            weekly = dict(db.session.execute(
+                select(PointsTransaction.student_id, func.sum(PointsTransaction.points))
+                .where(PointsTransaction.transaction_type == 'earned', PointsTransaction.created_at >= since)
+                .group_by(PointsTransaction.student_id)
+            ).all())
+            db.session.remove()
+            
+            global_board = RankedList(sorted(_key(score, student_id) for student_id, score in balances.items()))
+            weekly_board = RankedList(sorted(_key(score, student_id) for student_id, score in weekly.items()))
+            with self._lock:
+                self._boards = {'global': global_board, 'weekly': weekly_board}
+                self._scores = {'global': balances, 'weekly': weekly}
+                self._week = since
+                replay, self._replay = self._replay, None
+                for student_id, balance in replay:
+                    self._set('global', student_id, balance)
+        finally:
+            with self._lock:
+                self._replay = None
+
+    def _run(self):
+        while True:
+            try:
+                with self.app.app_context():
+                    self.rebuild()
+            except Exception as e:
+                print(f'Error rebuilding leaderboard: {str(e)}')
+            time.sleep(self.rebuild_interval)
+
+
+leaderboard = Leaderboard()
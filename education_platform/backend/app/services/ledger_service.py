@@ -0,0 +1,79 @@
+# backend/app/services/ledger_service.py
+from sqlalchemy import select, update, bindparam, func, union_all
+from ..models import db
+from ..models.student import Student
+from ..models.points import PointsTransaction, PointsMonthlySummary
+
+MAX_REPORTED_MISMATCHES = 1000
+
+
+def ledger_balances(student_ids):
+    """{student_id: sum of points_transactions plus rolled-up monthly summaries} for a set of students
+
+    Both tables are read in one UNION ALL statement so the sums come from a
+    single snapshot; a rollup moving rows into a summary between two separate
+    reads would otherwise be counted twice.
+    """
+    ledger = union_all(*(
+        select(model.student_id.label('student_id'), model.points.label('points'))
+        .where(model.student_id.in_(student_ids))
+        for model in (PointsTransaction, PointsMonthlySummary)
+    )).subquery()
+    rows = db.session.execute(
+        select(ledger.c.student_id, func.sum(ledger.c.points))
+        .group_by(ledger.c.student_id)
+    )
+    return {student_id: total or 0 for student_id, total in rows}
+
+
+def reconcile_balances(repair=False, chunk_size=1000):
+    """Compare students.points_balance with the points ledger (raw rows and monthly summaries).
+
+    Students are walked in id order, chunk_size at a time (keyset pagination),
+    and each chunk's ledger sums come from one grouped query over the
+    student_id index, so memory stays constant however large the tables are.
+    With repair, drifted balances are set to the ledger sum in one
+    executemany per chunk; the UPDATE only applies if the balance is still
+    the value that was checked, so concurrent earns and redemptions are not
+    overwritten. Returns {'checked', 'mismatched', 'repaired', 'mismatches'}.
+    """
+    table = Student.__table__
+    report = {'checked': 0, 'mismatched': 0, 'repaired': 0, 'mismatches': []}
+    last_id = 0
+    
+    while True:
+        students = db.session.execute(
+            select(table.c.id, table.c.points_balance)
+            .where(table.c.id > last_id)
+            .order_by(table.c.id)
+            .limit(chunk_size)
+        ).all()
+        if not students:
+            break
+        last_id = students[-1].id
+        
+        ledger = ledger_balances([student.id for student in students])
+        drifted = []
+        for student_id, balance in students:
+            expected = ledger.get(student_id, 0)
+            if (balance or 0) != expected:
+                drifted.append({'row_id': student_id, 'seen': balance, 'expected': expected})
+                if len(report['mismatches']) < MAX_REPORTED_MISMATCHES:
+                    report['mismatches'].append(
+                        {'student_id': student_id, 'balance': balance, 'ledger': expected})
+        
+        report['checked'] += len(students)
+        report['mismatched'] += len(drifted)
+        
+        if repair and drifted:
+            result = db.session.execute(
+                update(table)
+                .where(table.c.id == bindparam('row_id'))
+                .where(func.coalesce(table.c.points_balance, 0) == func.coalesce(bindparam('seen'), 0))
+                .values(points_balance=bindparam('expected')),
+                drifted
+            )
+            report['repaired'] += result.rowcount
+        db.session.commit()
+    
+    return report
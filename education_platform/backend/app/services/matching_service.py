@@ -0,0 +1,140 @@
+# backend/app/services/matching_service.py
+import heapq
+import itertools
+import threading
+import time
+
+
+class MatchQueue:
+    """Priority queue of socket sids; the lowest score pops first, ties in FIFO order.
+
+    push and pop are O(log n). remove marks the heap entry as dead in O(1) and
+    the heap is compacted once dead entries outnumber live ones.
+    """
+
+    _REMOVED = object()
+
+    def __init__(self):
+        self._heap = []
+        self._entries = {}
+        self._counter = itertools.count()
+
+    def push(self, sid, data, score=0):
+        if sid in self._entries:
+            return False
+        entry = [score, next(self._counter), sid, data]
+        self._entries[sid] = entry
+        heapq.heappush(self._heap, entry)
+        return True
+
+    def pop(self):
+        while self._heap:
+            score, seq, sid, data = heapq.heappop(self._heap)
+            if sid is not self._REMOVED:
+                del self._entries[sid]
+                return sid, data
+        return None
+
+    def remove(self, sid):
+        entry = self._entries.pop(sid, None)
+        if entry is None:
+            return None
+        entry[2] = self._REMOVED
+        if len(self._heap) > 2 * len(self._entries) + 64:
+            self._heap = [e for e in self._heap if e[2] is not self._REMOVED]
+            heapq.heapify(self._heap)
+        return entry[3]
+
+    def __contains__(self, sid):
+        return sid in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class FifoPolicy:
+    """Students and teachers are matched strictly in arrival order"""
+
+    def student_score(self, student_data):
+        return 0
+
+    def teacher_score(self, teacher_data):
+        return 0
+
+
+class BalancedPolicy:
+    """Hands each student the teacher with the least teaching time today.
+
+    Students are ordered by arrival time, so every waiting student ages at the
+    same rate and nobody can be overtaken indefinitely. With a non-zero
+    proficiency_boost, students are bucketed by training_progress (0-24, 25-49,
+    50-74, 75-100) and each bucket below the top gets that many seconds of head
+    start, which bounds any student's extra wait over FIFO to 3 * proficiency_boost.
+    """
+
+    def __init__(self, proficiency_boost=0):
+        self.proficiency_boost = proficiency_boost
+
+    def student_score(self, student_data):
+        bucket = min((student_data.get('training_progress') or 0) // 25, 3)
+        return time.time() - (3 - bucket) * self.proficiency_boost
+
+    def teacher_score(self, teacher_data):
+        return teacher_data.get('teaching_time_today', 0)
+
+
+def create_policy(config):
+    policy = config.get('MATCHING_POLICY', 'fifo')
+    if policy == 'fifo':
+        return FifoPolicy()
+    if policy == 'balanced':
+        return BalancedPolicy(config.get('MATCHING_PROFICIENCY_BOOST', 0))
+    raise ValueError(f'Unknown MATCHING_POLICY: {policy}')
+
+
+class MatchingService:
+    """Pairs waiting students with available teachers.
+
+    All operations take a single lock so the queues stay consistent when
+    Socket.IO runs handlers on several threads. The policy decides the order
+    in which each side is matched.
+    """
+
+    def __init__(self, policy=None):
+        self._lock = threading.Lock()
+        self.policy = policy or FifoPolicy()
+        self.waiting_students = MatchQueue()
+        self.available_teachers = MatchQueue()
+
+    def student_join(self, student_sid, student_data):
+        """Return (teacher_sid, teacher_data) if a teacher is free, else queue the student"""
+        with self._lock:
+            if student_sid in self.waiting_students:
+                return None
+            match = self.available_teachers.pop()
+            if match is None:
+                score = self.policy.student_score(student_data)
+                self.waiting_students.push(student_sid, student_data, score)
+            return match
+
+    def teacher_available(self, teacher_sid, teacher_data):
+        """Return (student_sid, student_data) if a student is waiting, else mark the teacher available"""
+        with self._lock:
+            if teacher_sid in self.available_teachers:
+                return None
+            match = self.waiting_students.pop()
+            if match is None:
+                score = self.policy.teacher_score(teacher_data)
+                self.available_teachers.push(teacher_sid, teacher_data, score)
+            return match
+
+    def remove(self, sid):
+        with self._lock:
+            self.waiting_students.remove(sid)
+            self.available_teachers.remove(sid)
+
+    def waiting_count(self):
+        return len(self.waiting_students)
+
+    def available_count(self):
+        return len(self.available_teachers)
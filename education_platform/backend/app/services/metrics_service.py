@@ -0,0 +1,154 @@
+# backend/app/services/metrics_service.py
+import threading
+import time
+from functools import wraps
+
+# Latency bucket upper bounds in milliseconds
+LATENCY_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, float('inf'))
+
+
+def _label(bound):
+    return '+Inf' if bound == float('inf') else bound
+
+
+class Histogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.count += 1
+        self.total += value
+
+    def percentile(self, p):
+        """Upper bound of the bucket holding the p-th percentile"""
+        if not self.count:
+            return None
+        target = self.count * p / 100
+        seen = 0
+        for bound, n in zip(self.buckets, self.counts):
+            seen += n
+            if seen >= target:
+                return bound
+        return self.buckets[-1]
+
+
+class EventStats:
+    def __init__(self):
+        self.latency_ms = Histogram()
+        self.errors = 0
+        self.emits = 0
+
+
+class Metrics:
+    """Per-event latency, error and emit counts plus live gauges for Socket.IO handlers and other timed work"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._events = {}
+        self._gauges = {}
+        self._local = threading.local()
+
+    def _stats(self, event):
+        stats = self._events.get(event)
+        if stats is None:
+            stats = self._events.setdefault(event, EventStats())
+        return stats
+
+    def instrument(self, event):
+        """Decorator recording latency and uncaught errors for one handler"""
+        def decorator(fn):
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                previous = getattr(self._local, 'event', None)
+                self._local.event = event
+                start = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                except Exception:
+                    self.record_error(event)
+                    raise
+                finally:
+                    self.observe(event, (time.perf_counter() - start) * 1000)
+                    self._local.event = previous
+            return wrapper
+        return decorator
+
+    def observe(self, event, elapsed_ms):
+        """Record one latency sample for a handler or any other timed operation"""
+        with self._lock:
+            self._stats(event).latency_ms.observe(elapsed_ms)
+
+    def current_event(self):
+        return getattr(self._local, 'event', None)
+
+    def record_emit(self, event=None, is_error=False):
+        """Count an emit (and optionally an error) against the handler being run"""
+        event = event or self.current_event() or 'unknown'
+        with self._lock:
+            stats = self._stats(event)
+            stats.emits += 1
+            if is_error:
+                stats.errors += 1
+
+    def record_error(self, event):
+        with self._lock:
+            self._stats(event).errors += 1
+
+    def gauge(self, name, fn):
+        """Register a callable read whenever a snapshot is taken"""
+        self._gauges[name] = fn
+
+    def snapshot(self):
+        with self._lock:
+            events = {
+                event: {
+                    'count': stats.latency_ms.count,
+                    'errors': stats.errors,
+                    'emits': stats.emits,
+                    'latency_ms': {
+                        'sum': round(stats.latency_ms.total, 3),
+                        'p50': _label(stats.latency_ms.percentile(50)),
+                        'p95': _label(stats.latency_ms.percentile(95)),
+                        'p99': _label(stats.latency_ms.percentile(99)),
+                        'buckets': dict(zip(
+                            [str(_label(b)) for b in stats.latency_ms.buckets],
+                            list(stats.latency_ms.counts)
+                        ))
+                    }
+                }
+                for event, stats in self._events.items()
+            }
+        gauges = {name: fn() for name, fn in self._gauges.items()}
+        return {'events': events, 'gauges': gauges}
+
+    def prometheus(self):
+        """Render the metrics in the Prometheus text exposition format"""
+        lines = [
+            '# TYPE socketio_event_latency_ms histogram',
+            '# TYPE socketio_event_errors_total counter',
+            '# TYPE socketio_event_emits_total counter',
+        ]
+        with self._lock:
+            for event, stats in self._events.items():
+                cumulative = 0
+                for bound, n in zip(stats.latency_ms.buckets, stats.latency_ms.counts):
+                    cumulative += n
+                    lines.append(f'socketio_event_latency_ms_bucket{{event="{event}",le="{_label(bound)}"}} {cumulative}')
+                lines.append(f'socketio_event_latency_ms_sum{{event="{event}"}} {stats.latency_ms.total:.3f}')
+                lines.append(f'socketio_event_latency_ms_count{{event="{event}"}} {stats.latency_ms.count}')
+                lines.append(f'socketio_event_errors_total{{event="{event}"}} {stats.errors}')
+                lines.append(f'socketio_event_emits_total{{event="{event}"}} {stats.emits}')
+        for name, fn in self._gauges.items():
+            lines.append(f'# TYPE {name} gauge')
+            lines.append(f'{name} {fn()}')
+        return '\n'.join(lines) + '\n'
+
+
+metrics = Metrics()
@@ -0,0 +1,133 @@
+# backend/app/services/onboarding_service.py
+import csv
+import json
+from sqlalchemy import insert
+from ..models import db
+from ..models.user import User
+from ..models.student import Student
+from ..models.teacher import Teacher
+from ..utils.validators import validate_email, validate_password, validate_mobile
+from ..utils.sql import dialect_insert
+from .password_service import password_hasher
+
+PROFILE_MODELS = {'student': Student, 'teacher': Teacher}
+
+
+def read_rows(stream, fmt):
+    """Yield dict rows from a text stream of CSV (with header) or JSONL"""
+    if fmt == 'csv':
+        for row in csv.DictReader(stream):
+            yield row
+    elif fmt == 'jsonl':
+        for line in stream:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+    else:
+        raise ValueError(f'Unsupported format: {fmt}')
+
+
+def _chunks(rows, size):
+    chunk = []
+    for number, row in enumerate(rows, start=1):
+        chunk.append((number, row))
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def validate_row(row):
+    """Return an error message for the row, or None if it can be imported"""
+    if not all(row.get(field) for field in ('email', 'password', 'name', 'mobile')):
+        return 'Missing required fields'
+    if not validate_email(row['email']):
+        return 'Invalid email format'
+    if not validate_password(row['password']):
+        return 'Password must be at least 6 characters'
+    if not validate_mobile(str(row['mobile'])):
+        return 'Invalid mobile number'
+    age = row.get('age')
+    if age not in (None, '') and not str(age).isdigit():
+        return 'Invalid age'
+    return None
+
+
+def import_users(rows, role, chunk_size=1000, workers=None):
+    """Create users and profiles for `role` from an iterable of dict rows.
+
+    Rows are processed in chunks: validation in Python, one IN query per chunk
+    to find emails already registered, password hashing spread over the shared
+    bulk process pool, and one multi-row INSERT each for users and profiles.
+    The user INSERT skips emails registered concurrently (ON CONFLICT DO
+    NOTHING), so only those rows are rejected. Each chunk commits on its own.
+    Returns {'created': n, 'errors': [{'row', 'email', 'error'}]}.
+    """
+    profile_model = PROFILE_MODELS[role]
+    created = 0
+    errors = []
+    seen = set()
+
+    for chunk in _chunks(rows, chunk_size):
+        valid = []
+        for number, row in chunk:
+            email = str(row.get('email') or '').strip()
+            row = dict(row, email=email)
+            error = validate_row(row)
+            if not error and email in seen:
+                error = 'Duplicate email in file'
+            if error:
+                errors.append({'row': number, 'email': email, 'error': error})
+                continue
+            seen.add(email)
+            valid.append((number, email, row))
+
+        if not valid:
+            continue
+
+        existing = {
+            email for (email,) in db.session.query(User.email)
+            .filter(User.email.in_([email for _, email, _ in valid]))
+        }
+        for number, email, row in valid:
+            if email in existing:
+                errors.append({'row': number, 'email': email, 'error': 'Email already registered'})
+        valid = [item for item in valid if item[1] not in existing]
+        if not valid:
+            continue
+
+        hashes = password_hasher.hash_many([row['password'] for _, _, row in valid], workers)
+
+        try:
+            user_ids = dict(db.session.execute(
+                dialect_insert(User.__table__)
+                .on_conflict_do_nothing(index_elements=['email'])
+                .returning(User.email, User.id),
+                [{'email': email, 'password_hash': password_hash, 'role': role}
+                 for (_, email, _), password_hash in zip(valid, hashes)]
+            ).all())
+            for number, email, _ in valid:
+                if email not in user_ids:
+                    errors.append({'row': number, 'email': email, 'error': 'Email already registered'})
+            valid = [item for item in valid if item[1] in user_ids]
+            if valid:
+                db.session.execute(insert(profile_model), [
+                    {
+                        'user_id': user_ids[email],
+                        'name': row['name'],
+                        'age': int(row['age']) if row.get('age') not in (None, '') else None,
+                        'education': row.get('education') or None,
+                        'profession': row.get('profession') or None,
+                        'mobile': str(row['mobile'])
+                    }
+                    for _, email, row in valid
+                ])
+            db.session.commit()
+            created += len(valid)
+        except Exception as e:
+            db.session.rollback()
+            for number, email, _ in valid:
+                errors.append({'row': number, 'email': email, 'error': str(e)})
+
+    return {'created': created, 'errors': errors}
@@ -0,0 +1,119 @@
+# backend/app/services/password_service.py
+import atexit
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from werkzeug.security import generate_password_hash, check_password_hash
+from .metrics_service import metrics
+
+
+def _timed(fn, *args):
+    # Runs in the worker process; wall clock times are comparable across processes
+    start = time.time()
+    result = fn(*args)
+    return result, start, time.time()
+
+
+def _hash_parameters(method):
+    # werkzeug fills in defaults ('scrypt' -> 'scrypt:32768:8:1'), so compare
+    # the parameters recorded in a real hash rather than the configured string
+    return tuple(generate_password_hash('', method).split('$', 1)[0].split(':'))
+
+
+def _mp_context():
+    # Forking a server process that already runs Socket.IO, scheduler and
+    # refill threads can deadlock the child on a lock held by another thread
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('forkserver')
+    return multiprocessing.get_context('spawn')
+
+
+class PasswordHasher:
+    """Runs werkzeug password hashing and verification in a bounded process pool.
+
+    Request threads block on the result but the CPU work happens in
+    PASSWORD_HASH_WORKERS separate processes, so a burst of logins cannot
+    starve the server. At most PASSWORD_HASH_MAX_PENDING operations may be
+    queued; beyond that callers wait up to PASSWORD_HASH_QUEUE_TIMEOUT seconds.
+    Queue and compute times are recorded in metrics as password_hash_queue and
+    password_hash_compute.
+    """
+
+    def __init__(self):
+        self.method = 'scrypt:32768:8:1'
+        self._parameters = ('scrypt', '32768', '8', '1')
+        self.workers = 0
+        self._executor = None
+        self._bulk_executor = None
+        self._slots = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.method = app.config['PASSWORD_HASH_METHOD']
+        self._parameters = _hash_parameters(self.method)
+        self.workers = app.config['PASSWORD_HASH_WORKERS']
+        self.queue_timeout = app.config['PASSWORD_HASH_QUEUE_TIMEOUT']
+        self._slots = threading.BoundedSemaphore(self.workers + app.config['PASSWORD_HASH_MAX_PENDING'])
+
+    def _pool(self):
+        # Created on first use so worker processes are not started at import time
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=_mp_context())
+                atexit.register(self.shutdown)
+            return self._executor
+
+    def _run(self, fn, *args):
+        if not self.workers:
+            return fn(*args)
+
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            raise RuntimeError('Server busy, please try again')
+        try:
+            submitted = time.time()
+            result, started, finished = self._pool().submit(_timed, fn, *args).result()
+        finally:
+            self._slots.release()
+
+        metrics.observe('password_hash_queue', (started - submitted) * 1000)
+        metrics.observe('password_hash_compute', (finished - started) * 1000)
+        return result
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, password_hash, password):
+        return self._run(check_password_hash, password_hash, password)
+
+    def _bulk_pool(self, workers):
+        # Separate from the login pool so a bulk import cannot queue logins;
+        # shared by every import in the process and sized on first use
+        with self._lock:
+            if self._bulk_executor is None:
+                self._bulk_executor = ProcessPoolExecutor(max_workers=workers or os.cpu_count(),
+                                                          mp_context=_mp_context())
+                atexit.register(self.shutdown)
+            return self._bulk_executor
+
+    def hash_many(self, passwords, workers=None):
+        """Hash a batch of passwords across the processes of the shared bulk pool"""
+        hash_one = partial(generate_password_hash, method=self.method)
+        return list(self._bulk_pool(workers).map(hash_one, passwords, chunksize=16))
+
+    def needs_rehash(self, password_hash):
+        """True if the hash was made with different parameters than PASSWORD_HASH_METHOD"""
+        return tuple(password_hash.split('$', 1)[0].split(':')) != self._parameters
+
+    def shutdown(self):
+        with self._lock:
+            for executor in (self._executor, self._bulk_executor):
+                if executor is not None:
+                    executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            self._bulk_executor = None
+
+
+password_hasher = PasswordHasher()
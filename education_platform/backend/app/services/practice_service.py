@@ -0,0 +1,148 @@
+# backend/app/services/practice_service.py
+import queue
+import random
+import threading
+from array import array
+from collections import OrderedDict
+from ..models import db
+from ..models.question import AnsweredQuestion
+from .question_cache import question_cache
+
+
+class PracticeQueues:
+    """Per-student queues of upcoming practice question ids.
+
+    Each (student, difficulty, question_type) queue is an array('I') with the
+    next question at the end, so serving a round is k pops. Queues are filled
+    with questions the student has not yet answered correctly, in random
+    order. A question answered wrongly is put back PRACTICE_REPEAT_GAP places
+    from the front so it comes round again soon; this is a fixed gap counted
+    in questions served, not an interval schedule. When a queue drops below
+    PRACTICE_QUEUE_LOW_WATERMARK a background thread tops it up to
+    PRACTICE_QUEUE_SIZE; a student's first request for a bucket therefore
+    comes back empty and the caller serves random questions meanwhile.
+
+    At most PRACTICE_QUEUE_MAX_QUEUES queues are kept, least recently used
+    dropped first. A refill that finds nothing new marks the queue exhausted
+    for the current question bank version, so later requests skip the
+    refill until the bank changes or the student answers from that queue.
+    """
+
+    def __init__(self):
+        self.app = None
+        self._lock = threading.Lock()
+        self._queues = OrderedDict()
+        self._exhausted = {}
+        self._pending = set()
+        self.max_queues = 10000
+        self._refills = queue.Queue()
+        self._thread = None
+
+    def init_app(self, app):
+        self.app = app
+        self.size = app.config['PRACTICE_QUEUE_SIZE']
+        self.low_watermark = app.config['PRACTICE_QUEUE_LOW_WATERMARK']
+        self.repeat_gap = app.config['PRACTICE_REPEAT_GAP']
+        self.max_queues = app.config['PRACTICE_QUEUE_MAX_QUEUES']
+        self._thread = threading.Thread(target=self._run, name='practice-refill', daemon=True)
+        self._thread.start()
+
+    def next_questions(self, student_id, difficulty, question_type, count):
+        """Pop up to `count` queued question payloads for the student.
+
+        Never queries the database: a cold or short queue returns what it
+        has and is topped up by the refill thread for later requests.
+        """
+        key = (student_id, difficulty, question_type)
+        exhausted = self._is_exhausted(key)
+        questions = []
+        with self._lock:
+            ids = self._queues.get(key, array('I'))
+            while ids and len(questions) < count:
+                question = question_cache.get(difficulty, question_type, ids.pop())
+                if question is not None:
+                    questions.append(question)
+            remaining = len(ids)
+            if key in self._queues:
+                self._queues.move_to_end(key)
+        
+        if remaining < self.low_watermark and not exhausted:
+            self._schedule(key)
+        return questions
+
+    def record_result(self, student_id, question, is_correct):
+        """Requeue a wrongly answered question a few places from the front"""
+        if is_correct:
+            return
+        key = (student_id, question.difficulty, question.question_type)
+        with self._lock:
+            self._exhausted.pop(key, None)
+            ids = self._queues.get(key)
+            if ids is None:
+                ids = self._store(key, array('I'))
+            if question.id not in ids:
+                ids.insert(max(0, len(ids) - self.repeat_gap), question.id)
+
+    def refill(self, key):
+        """Top the queue up with unanswered questions not already queued"""
+        student_id, difficulty, question_type = key
+        version = question_cache.version()
+        with self._lock:
+            queued = set(self._queues.get(key, ()))
+        
+        answered = {
+            question_id for (question_id,) in db.session.query(AnsweredQuestion.question_id)
+            .filter_by(student_id=student_id)
+        }
+        fresh = [question_id for question_id in question_cache.ids(difficulty, question_type)
+                 if question_id not in answered and question_id not in queued]
+        random.shuffle(fresh)
+        
+        with self._lock:
+            ids = self._queues.get(key, array('I'))
+            if not fresh:
+                self._exhausted[key] = version
+            fresh = fresh[:max(0, self.size - len(ids))]
+            self._store(key, array('I', fresh) + ids)
+            self._pending.discard(key)
+
+    def _store(self, key, ids):
+        # Caller holds the lock
+        self._queues[key] = ids
+        self._queues.move_to_end(key)
+        while len(self._queues) > self.max_queues:
+            evicted, _ = self._queues.popitem(last=False)
+            self._exhausted.pop(evicted, None)
+        return ids
+
+    def _is_exhausted(self, key):
+        version = self._exhausted.get(key)
+        if version is None:
+            return False
+        if version != question_cache.version():
+            with self._lock:
+                self._exhausted.pop(key, None)
+            return False
+        return True
+
+    def _schedule(self, key):
+        with self._lock:
+            if key in self._pending:
+                return
+            self._pending.add(key)
+        self._refills.put(key)
+
+    def _run(self):
+        while True:
+            key = self._refills.get()
+            try:
+                with self.app.app_context():
+                    self.refill(key)
+                    db.session.remove()
+            except Exception as e:
+                with self._lock:
+                    self._pending.discard(key)
+                print(f'Error refilling practice queue: {str(e)}')
+
+
+practice_queues = PracticeQueues()
@@ -0,0 +1,95 @@
+# backend/app/services/presence_service.py
+import math
+import threading
+
+
+class TimingWheel:
+    """Hashed timing wheel where every key expires `timeout_ticks` ticks after its last touch.
+
+    touch, remove and tick are O(1) per key: a tick just detaches the slot that
+    has come due, so the cost never depends on how many keys are still live.
+    """
+
+    def __init__(self, timeout_ticks):
+        self.size = timeout_ticks + 1
+        self.slots = [set() for _ in range(self.size)]
+        self.slot_of = {}
+        self.current = 0
+
+    def touch(self, key):
+        slot = (self.current + self.size - 1) % self.size
+        old = self.slot_of.get(key)
+        if old is not None:
+            self.slots[old].discard(key)
+        self.slots[slot].add(key)
+        self.slot_of[key] = slot
+
+    def remove(self, key):
+        slot = self.slot_of.pop(key, None)
+        if slot is not None:
+            self.slots[slot].discard(key)
+
+    def tick(self):
+        self.current = (self.current + 1) % self.size
+        expired = self.slots[self.current]
+        self.slots[self.current] = set()
+        for key in expired:
+            del self.slot_of[key]
+        return expired
+
+    def __len__(self):
+        return len(self.slot_of)
+
+
+class PresenceService:
+    """Tracks client heartbeats and reports sids that have gone quiet.
+
+    Clients emit 'heartbeat' periodically; a background task advances the
+    wheel every PRESENCE_TICK_SECONDS and passes the sids not heard from for
+    PRESENCE_TIMEOUT_SECONDS to the registered expired handlers.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._handlers = []
+        self.tick_seconds = 1
+        self.wheel = TimingWheel(90)
+
+    def init_app(self, app, socketio):
+        self.tick_seconds = app.config['PRESENCE_TICK_SECONDS']
+        timeout_ticks = max(1, math.ceil(app.config['PRESENCE_TIMEOUT_SECONDS'] / self.tick_seconds))
+        with self._lock:
+            self.wheel = TimingWheel(timeout_ticks)
+        socketio.start_background_task(self._run, socketio)
+
+    def expired_handler(self, fn):
+        """Register fn(sids) to be called with each batch of expired sids"""
+        self._handlers.append(fn)
+        return fn
+
+    def touch(self, sid):
+        with self._lock:
+            self.wheel.touch(sid)
+
+    def forget(self, sid):
+        with self._lock:
+            self.wheel.remove(sid)
+
+    def tracked_count(self):
+        return len(self.wheel)
+
+    def _run(self, socketio):
+        while True:
+            socketio.sleep(self.tick_seconds)
+            with self._lock:
+                expired = self.wheel.tick()
+            if not expired:
+                continue
+            for handler in self._handlers:
+                try:
+                    handler(expired)
+                except Exception as e:
+                    print(f'Error in presence handler: {str(e)}')
+
+
+presence = PresenceService()
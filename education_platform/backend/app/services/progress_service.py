@@ -0,0 +1,42 @@
+# backend/app/services/progress_service.py
+from ..models import db
+from ..models.question import AnsweredQuestion
+from ..models.student import Student
+from ..utils.sql import dialect_insert
+from .counter_service import increment
+from .question_cache import question_cache
+
+# Progress is kept incrementally: answered_questions holds one row per
+# (student, question) behind a unique index, students.questions_answered
+# counts those rows, and the active question total comes from the cache.
+
+
+def record_correct_answers(student, question_ids):
+    """Mark questions answered for the student and return the new progress percentage.
+
+    All rows go in one INSERT; questions answered before are skipped by the
+    unique index and leave the count and progress unchanged.
+    """
+    rows = [{'student_id': student.id, 'question_id': question_id}
+            for question_id in dict.fromkeys(question_ids)]
+    if not rows:
+        return student.training_progress
+    
+    result = db.session.execute(
+        dialect_insert(AnsweredQuestion.__table__).on_conflict_do_nothing()
+        .values(rows)
+        .returning(AnsweredQuestion.id)
+    )
+    new_answers = len(result.all())
+    if not new_answers:
+        return student.training_progress
+    
+    answered = increment(Student, 'questions_answered', student.id, new_answers)
+    total_questions = question_cache.active_count()
+    progress = min(100, answered * 100 // total_questions) if total_questions else 0
+    student.training_progress = progress
+    return progress
+
+
+def record_correct_answer(student, question_id):
+    return record_correct_answers(student, [question_id])
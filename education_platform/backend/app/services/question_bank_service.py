@@ -0,0 +1,168 @@
+# backend/app/services/question_bank_service.py
+import csv
+import io
+import json
+import uuid
+from flask import current_app
+from sqlalchemy import select, update
+from ..models import db
+from ..models.question import Question
+from ..utils.sql import dialect_insert
+from .question_cache import question_cache
+
+FIELDS = ['external_id', 'question_text', 'question_type', 'difficulty', 'points_value',
+          'option_a', 'option_b', 'option_c', 'option_d', 'correct_answer',
+          'expected_keywords', 'is_active']
+MAX_REPORTED_ERRORS = 1000
+
+
+def _flag(value):
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() not in ('0', 'false', 'no', '')
+
+
+def clean_question(row):
+    """Return (record, None) for an importable row, or (None, error message)"""
+    external_id = str(row.get('external_id') or '').strip()
+    question_text = str(row.get('question_text') or '').strip()
+    question_type = row.get('question_type')
+    difficulty = row.get('difficulty') or 'easy'
+    
+    if not external_id or not question_text:
+        return None, 'external_id and question_text are required'
+    if len(external_id) > 64:
+        return None, 'external_id is longer than 64 characters'
+    if question_type not in ('mcq', 'speaking'):
+        return None, 'question_type must be mcq or speaking'
+    if difficulty not in ('easy', 'medium', 'hard'):
+        return None, 'difficulty must be easy, medium or hard'
+    
+    points_value = row.get('points_value')
+    if points_value in (None, ''):
+        points_value = current_app.config[f'POINTS_{difficulty.upper()}']
+    elif not str(points_value).isdigit():
+        return None, 'Invalid points_value'
+    
+    record = {
+        'external_id': external_id,
+        'question_text': question_text,
+        'question_type': question_type,
+        'difficulty': difficulty,
+        'points_value': int(points_value),
+        'option_a': None, 'option_b': None, 'option_c': None, 'option_d': None,
+        'correct_answer': None,
+        'expected_keywords': None,
+        'is_active': _flag(row.get('is_active', True))
+    }
+    
+    if question_type == 'mcq':
+        options = {key: row.get(key) for key in ('option_a', 'option_b', 'option_c', 'option_d')}
+        if not all(options.values()):
+            return None, 'MCQ questions need option_a to option_d'
+        correct_answer = str(row.get('correct_answer') or '').strip().upper()
+        if correct_answer not in ('A', 'B', 'C', 'D'):
+            return None, 'correct_answer must be A, B, C or D'
+        record.update(options, correct_answer=correct_answer)
+    else:
+        keywords = row.get('expected_keywords') or []
+        if isinstance(keywords, str):
+            try:
+                keywords = json.loads(keywords)
+            except ValueError:
+                return None, 'expected_keywords must be a JSON list'
+        if not isinstance(keywords, list) or not keywords:
+            return None, 'Speaking questions need expected_keywords'
+        record['expected_keywords'] = json.dumps(keywords)
+    
+    return record, None
+
+
+def _batches(rows, size, batch_id, report):
+    # Validation pipeline: only one batch of cleaned records is held at a time
+    batch = []
+    for number, row in enumerate(rows, start=1):
+        record, error = clean_question(row)
+        if error:
+            report['rejected'] += 1
+            if len(report['errors']) < MAX_REPORTED_ERRORS:
+                report['errors'].append({'row': number, 'external_id': row.get('external_id'), 'error': error})
+            continue
+        record['import_batch'] = batch_id
+        batch.append(record)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def import_questions(rows, batch_size=1000, deactivate_missing=False):
+    """Upsert questions by external_id from an iterable of dict rows.
+
+    Each batch is one INSERT ... ON CONFLICT (external_id) DO UPDATE and
+    commits on its own. Every upserted row is stamped with this import's
+    batch id, so with deactivate_missing a single UPDATE deactivates all
+    questions the file no longer contains. Returns
+    {'upserted', 'rejected', 'deactivated', 'errors'} (errors capped at 1000).
+    """
+    batch_id = uuid.uuid4().hex
+    report = {'upserted': 0, 'rejected': 0, 'deactivated': 0, 'errors': []}
+    table = Question.__table__
+    
+    for batch in _batches(rows, batch_size, batch_id, report):
+        stmt = dialect_insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.external_id],
+            set_={field: stmt.excluded[field] for field in FIELDS[1:] + ['import_batch']}
+        )
+        db.session.execute(stmt, batch)
+        db.session.commit()
+        report['upserted'] += len(batch)
+    
+    if deactivate_missing and report['upserted']:
+        result = db.session.execute(
+            update(table)
+            .where(table.c.is_active.is_(True))
+            .where((table.c.import_batch != batch_id) | table.c.import_batch.is_(None))
+            .values(is_active=False)
+        )
+        report['deactivated'] = result.rowcount
+    
+    question_cache.invalidate()
+    db.session.commit()
+    return report
+
+
+def export_questions(fmt, batch_size=1000):
+    """Yield the question bank as JSONL lines or CSV text, streamed from a server-side cursor"""
+    if fmt not in ('csv', 'jsonl'):
+        raise ValueError(f'Unsupported format: {fmt}')
+    
+    columns = [Question.__table__.c[field] for field in FIELDS]
+    result = db.session.execute(
+        select(*columns).order_by(Question.id).execution_options(yield_per=batch_size)
+    )
+    
+    if fmt == 'csv':
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(FIELDS)
+    
+    for rows in result.partitions():
+        if fmt == 'jsonl':
+            lines = []
+            for row in rows:
+                record = dict(row._mapping)
+                if record['expected_keywords']:
+                    record['expected_keywords'] = json.loads(record['expected_keywords'])
+                lines.append(json.dumps(record) + '\n')
+            yield ''.join(lines)
+        else:
+            writer.writerows(rows)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    
+    if fmt == 'csv' and buffer.tell():
+        yield buffer.getvalue()
@@ -0,0 +1,103 @@
+# backend/app/services/question_cache.py
+import random
+import threading
+import time
+from ..models import db
+from ..models.question import Question, QuestionBankVersion
+from .counter_service import increment
+
+
+class QuestionCache:
+    """Active questions grouped by (difficulty, question_type) as ready-to-serialize payloads.
+
+    Buckets are loaded on first use and sampled without touching the database.
+    The shared version stamp in question_bank_version is checked at most every
+    QUESTION_CACHE_CHECK_SECONDS; when another process has bumped it, all
+    buckets are dropped and reloaded lazily.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets = {}
+        self._by_id = {}
+        self._active_count = None
+        self._version = None
+        self._checked_at = 0
+        self.check_interval = 5
+
+    def init_app(self, app):
+        self.check_interval = app.config['QUESTION_CACHE_CHECK_SECONDS']
+
+    def _check_version(self):
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval:
+            return
+        version = QuestionBankVersion.current()
+        with self._lock:
+            if version != self._version:
+                self._buckets = {}
+                self._by_id = {}
+                self._active_count = None
+                self._version = version
+            self._checked_at = now
+
+    def _load(self, difficulty, question_type):
+        questions = Question.query.filter_by(
+            difficulty=difficulty,
+            question_type=question_type,
+            is_active=True
+        ).all()
+        records = [q.to_dict() for q in questions]
+        with self._lock:
+            self._buckets[(difficulty, question_type)] = records
+            self._by_id.update((record['id'], record) for record in records)
+        return records
+
+    def _bucket(self, difficulty, question_type):
+        self._check_version()
+        records = self._buckets.get((difficulty, question_type))
+        if records is None:
+            records = self._load(difficulty, question_type)
+        return records
+
+    def sample(self, difficulty, question_type, count):
+        """Up to `count` random question payloads from one bucket"""
+        records = self._bucket(difficulty, question_type)
+        return random.sample(records, min(count, len(records)))
+
+    def ids(self, difficulty, question_type):
+        """Ids of the active questions in one bucket"""
+        return [record['id'] for record in self._bucket(difficulty, question_type)]
+
+    def get(self, difficulty, question_type, question_id):
+        """Payload of an active question in the bucket, or None if it is gone"""
+        self._bucket(difficulty, question_type)
+        return self._by_id.get(question_id)
+
+    def version(self):
+        """Question bank version the cached buckets belong to"""
+        self._check_version()
+        return self._version
+
+    def active_count(self):
+        """Number of active questions, cached alongside the buckets"""
+        self._check_version()
+        total = self._active_count
+        if total is None:
+            total = Question.query.filter_by(is_active=True).count()
+            with self._lock:
+                self._active_count = total
+        return total
+
+    def invalidate(self):
+        """Bump the shared version stamp (committed with the caller's transaction) and drop local buckets"""
+        if increment(QuestionBankVersion, 'version', 1, 1) is None:
+            db.session.add(QuestionBankVersion(id=1, version=1))
+        with self._lock:
+            self._buckets = {}
+            self._by_id = {}
+            self._active_count = None
+            self._checked_at = 0
+
+
+question_cache = QuestionCache()
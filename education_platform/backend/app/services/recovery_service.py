@@ -0,0 +1,164 @@
+# backend/app/services/recovery_service.py
+import threading
+from datetime import datetime
+from sqlalchemy import update, bindparam, or_
+from ..models import db
+from ..models.session import VideoSession
+from ..models.student import Student
+from ..models.teacher import Teacher
+from .counter_service import increment_many
+from .state_backend import state
+
+CLOSE_CHUNK_SIZE = 500
+
+
+class RecoveryService:
+    """Rebuilds call state after a restart from VideoSession rows still marked active.
+
+    Only rows whose worker_id is not a live worker (see StateBackend.live_workers)
+    are orphaned, so a worker starting next to others never touches their calls.
+    Orphaned rooms are held for SESSION_RESUME_GRACE_SECONDS so both peers can
+    reconnect with 'resume_session'; a resumed room is handed to this worker.
+    Rooms not fully resumed by then are closed in bulk as 'terminated', with
+    the duration running up to the restart.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._orphaned = {}
+        self.app = None
+        self.restarted_at = None
+
+    def init_app(self, app, socketio):
+        self.app = app
+        self.restarted_at = datetime.utcnow()
+        with app.app_context():
+            self.load()
+
+        grace = app.config['SESSION_RESUME_GRACE_SECONDS']
+        if not self._orphaned:
+            return
+        if grace > 0:
+            socketio.start_background_task(self._close_after_grace, socketio, grace)
+        else:
+            self.close_orphaned(socketio)
+
+    def load(self):
+        # One indexed query returning plain tuples; no ORM objects are built
+        rows = db.session.query(
+            VideoSession.room_id,
+            VideoSession.student_id,
+            VideoSession.teacher_id,
+            VideoSession.start_time
+        ).filter(
+            VideoSession.status == 'active',
+            VideoSession.start_time < self.restarted_at,
+            self._orphan_owner()
+        ).all()
+
+        with self._lock:
+            self._orphaned = {
+                room_id: {
+                    'student_sid': None,
+                    'teacher_sid': None,
+                    'student_id': student_id,
+                    'teacher_id': teacher_id,
+                    'start_time': start_time
+                }
+                for room_id, student_id, teacher_id, start_time in rows
+            }
+        if rows:
+            print(f'Recovered {len(rows)} active sessions awaiting resume')
+
+    def resume(self, room_id, role, profile_id, sid):
+        """Attach a reconnected peer to an orphaned room.
+
+        Returns (session_data, complete) where complete means both peers are
+        back, or None if the room is unknown or belongs to someone else.
+        """
+        with self._lock:
+            session_data = self._orphaned.get(room_id)
+            if not session_data or session_data[f'{role}_id'] != profile_id:
+                return None
+            session_data[f'{role}_sid'] = sid
+            complete = session_data['student_sid'] and session_data['teacher_sid']
+            if complete:
+                del self._orphaned[room_id]
+            return dict(session_data), bool(complete)
+
+    def _orphan_owner(self):
+        # Rows from before worker ids were recorded count as orphaned
+        column = VideoSession.__table__.c.worker_id
+        return or_(column.is_(None), column.notin_(list(state.live_workers())))
+
+    def orphaned_count(self):
+        return len(self._orphaned)
+
+    def _close_after_grace(self, socketio, grace):
+        socketio.sleep(grace)
+        try:
+            self.close_orphaned(socketio)
+        except Exception as e:
+            print(f'Error closing orphaned sessions: {str(e)}')
+
+    def close_orphaned(self, socketio):
+        with self._lock:
+            orphaned = self._orphaned
+            self._orphaned = {}
+        if not orphaned:
+            return
+
+        room_ids = list(orphaned)
+        closed = 0
+        with self.app.app_context():
+            for i in range(0, len(room_ids), CLOSE_CHUNK_SIZE):
+                closed += self._close_chunk(room_ids[i:i + CLOSE_CHUNK_SIZE])
+
+        # Tell any peer that did reconnect that the call is over
+        for room_id, session_data in orphaned.items():
+            if session_data['student_sid'] or session_data['teacher_sid']:
+                socketio.emit('call_ended', {
+                    'duration': int((self.restarted_at - session_data['start_time']).total_seconds()),
+                    'message': 'Partner did not reconnect'
+                }, room=room_id)
+                socketio.close_room(room_id)
+
+        print(f'Closed {closed} orphaned sessions')
+
+    def _close_chunk(self, room_ids):
+        # Claiming rows with status='active' in the UPDATE itself means a row
+        # is only ever closed (and credited) by one worker, and re-checking the
+        # owner skips rooms another live worker has resumed meanwhile
+        table = VideoSession.__table__
+        claimed = db.session.execute(
+            update(table)
+            .where(table.c.room_id.in_(room_ids), table.c.status == 'active', self._orphan_owner())
+            .values(status='terminated', end_time=self.restarted_at)
+            .returning(table.c.id, table.c.student_id, table.c.teacher_id, table.c.start_time)
+        ).all()
+
+        durations = []
+        student_time = {}
+        teacher_time = {}
+        for session_id, student_id, teacher_id, start_time in claimed:
+            duration = max(0, int((self.restarted_at - start_time).total_seconds()))
+            durations.append({'row_id': session_id, 'new_duration': duration})
+            student_time[student_id] = student_time.get(student_id, 0) + duration
+            teacher_time[teacher_id] = teacher_time.get(teacher_id, 0) + duration
+            state.sessions.add_teaching_time(teacher_id, start_time.date().isoformat(), duration)
+
+        if durations:
+            db.session.execute(
+                update(table)
+                .where(table.c.id == bindparam('row_id'))
+                .values(duration=bindparam('new_duration')),
+                durations
+            )
+            increment_many(Student, 'total_video_time', student_time)
+            increment_many(Teacher, 'total_teaching_time', teacher_time)
+
+        db.session.commit()
+        return len(claimed)
+
+
+recovery = RecoveryService()
@@ -0,0 +1,223 @@
+# backend/app/services/redemption_service.py
+import importlib
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from sqlalchemy import select, update, insert, bindparam, and_
+from ..models import db
+from ..models.student import Student
+from ..models.points import PointsTransaction, RedemptionRequest
+from .counter_service import increment_many
+from .leaderboard_service import leaderboard
+
+
+class FakePayoutAdapter:
+    """Local stand-in for a payout provider: approves everything except UPI ids ending in '@fail'"""
+
+    def pay(self, requests):
+        results = {}
+        for request in requests:
+            if request['redemption_type'] == 'upi' and (request['upi_id'] or '').endswith('@fail'):
+                results[request['id']] = (False, 'UPI payout rejected')
+            else:
+                results[request['id']] = (True, f"fake-{request['id']}")
+        return results
+
+
+ADAPTERS = {'fake': FakePayoutAdapter}
+
+
+def create_adapter(name):
+    """Adapter by short name, or 'package.module:ClassName' for a custom provider.
+
+    Adapters implement pay(requests) -> {request_id: (ok, reference_or_reason)}
+    for a list of dicts with id, student_id, points_redeemed, redemption_type
+    and upi_id. A request is paid at most once: if the adapter raises, leaves
+    an id out of its results, or the process dies before the results are
+    recorded, the request is moved to 'payout_unknown' for manual
+    reconciliation with the provider instead of being sent again.
+    """
+    if name in ADAPTERS:
+        return ADAPTERS[name]()
+    if name and ':' in name:
+        module, cls = name.split(':', 1)
+        return getattr(importlib.import_module(module), cls)()
+    raise ValueError(f'Unknown REDEMPTION_PAYOUT_ADAPTER: {name}')
+
+
+class RedemptionProcessor:
+    """Pays out pending redemption requests in chunks.
+
+    A chunk is claimed with one UPDATE ... RETURNING that moves rows to
+    'processing' under a fresh claim token, so concurrent processors never
+    share a row. After the adapter answers, approvals and rejections are
+    written in bulk in one transaction, together with refunds (balance
+    increment plus a 'refunded' ledger row) for rejected payouts. Every
+    write is guarded by the claim token. Requests whose outcome is not
+    known (adapter error, missing result, or left in 'processing' past the
+    claim timeout by a crash) end in 'payout_unknown' and are never paid again.
+    """
+
+    def __init__(self):
+        self.app = None
+        self.chunk_size = 500
+        self.claim_timeout = 600
+
+    def init_app(self, app):
+        self.app = app
+        self.chunk_size = app.config['REDEMPTION_CHUNK_SIZE']
+        self.claim_timeout = app.config['REDEMPTION_CLAIM_TIMEOUT_SECONDS']
+        self.interval = app.config['REDEMPTION_WORKER_INTERVAL']
+        adapter = app.config['REDEMPTION_PAYOUT_ADAPTER']
+        if adapter and self.interval:
+            thread = threading.Thread(target=self._run, args=(create_adapter(adapter),),
+                                      name='redemption-processor', daemon=True)
+            thread.start()
+
+    def claim(self, limit):
+        table = RedemptionRequest.__table__
+        now = datetime.utcnow()
+        token = uuid.uuid4().hex
+        rows = db.session.execute(
+            update(table)
+            .where(table.c.id.in_(
+                select(table.c.id)
+                .where(table.c.status == 'pending')
+                .order_by(table.c.created_at)
+                .limit(limit)
+            ))
+            .where(table.c.status == 'pending')
+            .values(status='processing', claim_token=token, claimed_at=now)
+            .returning(table.c.id, table.c.student_id, table.c.points_redeemed,
+                       table.c.redemption_type, table.c.upi_id)
+        ).mappings().all()
+        db.session.commit()
+        return token, [dict(row) for row in rows]
+
+    def expire_stale(self, limit):
+        """Move up to `limit` rows stuck in 'processing' past the claim timeout to 'payout_unknown'"""
+        table = RedemptionRequest.__table__
+        stale = and_(table.c.status == 'processing',
+                     table.c.claimed_at < datetime.utcnow() - timedelta(seconds=self.claim_timeout))
+        result = db.session.execute(
+            update(table)
+            .where(table.c.id.in_(
+                select(table.c.id).where(stale).order_by(table.c.created_at).limit(limit)
+            ))
+            .where(stale)
+            .values(status='payout_unknown', processed_at=datetime.utcnow(),
+                    failure_reason='Payout outcome not recorded before the claim timeout')
+        )
+        db.session.commit()
+        return result.rowcount
+
+    def mark_unknown(self, token, request_ids, reason):
+        """Park claimed requests whose payout outcome is not known"""
+        if not request_ids:
+            return 0
+        table = RedemptionRequest.__table__
+        result = db.session.execute(
+            update(table)
+            .where(table.c.id.in_(request_ids), table.c.claim_token == token)
+            .values(status='payout_unknown', processed_at=datetime.utcnow(), failure_reason=reason[:200])
+        )
+        db.session.commit()
+        return result.rowcount
+
+    def settle(self, token, results):
+        """Record adapter results for a claimed chunk, refund failed payouts and push refunded balances to the leaderboard"""
+        table = RedemptionRequest.__table__
+        now = datetime.utcnow()
+        approved = [{'row_id': request_id, 'reference': reference}
+                    for request_id, (ok, reference) in results.items() if ok]
+        rejected = {request_id: reason for request_id, (ok, reason) in results.items() if not ok}
+        
+        if approved:
+            db.session.execute(
+                update(table)
+                .where(table.c.id == bindparam('row_id'), table.c.claim_token == token)
+                .values(status='approved', processed_at=now, payout_reference=bindparam('reference')),
+                approved
+            )
+        
+        refunded = []
+        balances = {}
+        if rejected:
+            refunded = db.session.execute(
+                update(table)
+                .where(table.c.id.in_(list(rejected)), table.c.claim_token == token)
+                .values(status='rejected', processed_at=now)
+                .returning(table.c.id, table.c.student_id, table.c.points_redeemed)
+            ).all()
+            db.session.execute(
+                update(table)
+                .where(table.c.id == bindparam('row_id'), table.c.claim_token == token)
+                .values(failure_reason=bindparam('reason')),
+                [{'row_id': request_id, 'reason': str(reason)[:200]} for request_id, reason in rejected.items()]
+            )
+        
+        if refunded:
+            deltas = {}
+            for _, student_id, points in refunded:
+                deltas[student_id] = deltas.get(student_id, 0) + points
+            increment_many(Student, 'points_balance', deltas)
+            db.session.execute(insert(PointsTransaction), [
+                {
+                    'student_id': student_id,
+                    'points': points,
+                    'transaction_type': 'refunded',
+                    'description': f'Refund for redemption #{request_id}'
+                }
+                for request_id, student_id, points in refunded
+            ])
+            balances = dict(db.session.execute(
+                select(Student.id, Student.points_balance).where(Student.id.in_(list(deltas)))
+            ).all())
+        
+        db.session.commit()
+        for student_id, balance in balances.items():
+            leaderboard.set_balance(student_id, balance)
+        return len(approved), len(refunded)
+
+    def process(self, adapter, limit=None):
+        """Claim and settle chunks until nothing is pending (or `limit` requests are done)"""
+        report = {'approved': 0, 'rejected': 0, 'unknown': self.expire_stale(self.chunk_size)}
+        done = 0
+        while limit is None or done < limit:
+            size = self.chunk_size if limit is None else min(self.chunk_size, limit - done)
+            token, requests = self.claim(size)
+            if not requests:
+                break
+            done += len(requests)
+            request_ids = [request['id'] for request in requests]
+            
+            try:
+                results = adapter.pay(requests)
+            except Exception as e:
+                # Some payouts may have gone through; never send them again
+                print(f'Payout adapter failed for {len(requests)} redemptions: {str(e)}')
+                report['unknown'] += self.mark_unknown(token, request_ids, f'Payout adapter error: {str(e)}')
+                continue
+            
+            missing = [request_id for request_id in request_ids if request_id not in results]
+            approved, rejected = self.settle(token, {
+                request_id: results[request_id] for request_id in request_ids if request_id in results
+            })
+            report['approved'] += approved
+            report['rejected'] += rejected
+            report['unknown'] += self.mark_unknown(token, missing, 'No result from payout adapter')
+        return report
+
+    def _run(self, adapter):
+        while True:
+            try:
+                with self.app.app_context():
+                    self.process(adapter)
+                    db.session.remove()
+            except Exception as e:
+                print(f'Error processing redemptions: {str(e)}')
+            time.sleep(self.interval)
+
+
+redemption_processor = RedemptionProcessor()
@@ -0,0 +1,87 @@
+# backend/app/services/rollup_service.py
+from datetime import datetime, timedelta, date
+from sqlalchemy import select, insert, delete
+from ..models import db
+from ..models.points import PointsTransaction, PointsTransactionArchive, PointsMonthlySummary
+from ..utils.sql import dialect_insert
+
+COLUMNS = ['id', 'student_id', 'points', 'transaction_type', 'description', 'question_id', 'created_at']
+
+
+def month_start(dt):
+    return date(dt.year, dt.month, 1)
+
+
+def month_end(month):
+    # Last instant of the month, so summaries sort after that month's raw rows
+    following = date(month.year + month.month // 12, month.month % 12 + 1, 1)
+    return datetime.combine(following, datetime.min.time()) - timedelta(microseconds=1)
+
+
+def rollup_cutoff(horizon_days, now=None):
+    """Start of the month containing now - horizon; only whole months before it are rolled up"""
+    horizon = (now or datetime.utcnow()) - timedelta(days=horizon_days)
+    return datetime.combine(month_start(horizon), datetime.min.time())
+
+
+def rollup_transactions(horizon_days, chunk_size=5000):
+    """Fold points_transactions older than the horizon into monthly summaries.
+
+    Works oldest id first, chunk_size rows at a time. Each chunk is one
+    transaction: the raw rows are copied to points_transactions_archive,
+    their totals are added to points_monthly_summaries per (student, month,
+    transaction type) with one upsert, and they are deleted from the hot
+    table. An interrupted run leaves every chunk either fully rolled up or
+    untouched, so it can simply be run again. Returns
+    {'cutoff', 'archived', 'summaries'}.
+    """
+    cutoff = rollup_cutoff(horizon_days)
+    table = PointsTransaction.__table__
+    summaries = PointsMonthlySummary.__table__
+    report = {'cutoff': cutoff.isoformat(), 'archived': 0, 'summaries': 0}
+    
+    while True:
+        rows = db.session.execute(
+            select(*[table.c[column] for column in COLUMNS])
+            .where(table.c.created_at < cutoff)
+            .order_by(table.c.id)
+            .limit(chunk_size)
+        ).mappings().all()
+        if not rows:
+            break
+        
+        totals = {}
+        for row in rows:
+            key = (row['student_id'], month_start(row['created_at']), row['transaction_type'])
+            points, count = totals.get(key, (0, 0))
+            totals[key] = (points + row['points'], count + 1)
+        
+        db.session.execute(insert(PointsTransactionArchive), [dict(row) for row in rows])
+        
+        stmt = dialect_insert(summaries)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[summaries.c.student_id, summaries.c.month, summaries.c.transaction_type],
+            set_={
+                'points': summaries.c.points + stmt.excluded.points,
+                'transaction_count': summaries.c.transaction_count + stmt.excluded.transaction_count
+            }
+        )
+        db.session.execute(stmt, [
+            {
+                'student_id': student_id,
+                'month': month,
+                'transaction_type': transaction_type,
+                'points': points,
+                'transaction_count': count,
+                'created_at': month_end(month)
+            }
+            for (student_id, month, transaction_type), (points, count) in totals.items()
+        ])
+        
+        db.session.execute(delete(table).where(table.c.id.in_([row['id'] for row in rows])))
+        db.session.commit()
+        
+        report['archived'] += len(rows)
+        report['summaries'] += len(totals)
+    
+    return report
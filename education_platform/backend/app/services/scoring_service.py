@@ -0,0 +1,116 @@
+# backend/app/services/scoring_service.py
+import json
+import re
+import threading
+
+_TOKEN = re.compile(r"[a-z0-9']+")
+
+
+def _stem(token):
+    # Light suffix stripping so "works"/"worked"/"working" all match "work"
+    if token.endswith('s') and not token.endswith('ss') and len(token) > 3:
+        token = token[:-1]
+    for suffix in ('ing', 'ed'):
+        if token.endswith(suffix) and len(token) - len(suffix) >= 3:
+            token = token[:-len(suffix)]
+            break
+    if token.endswith('e') and len(token) > 3:
+        token = token[:-1]
+    return token
+
+
+def tokenize(text):
+    return [_stem(match.group()) for match in _TOKEN.finditer(text.lower())]
+
+
+class CompiledKeywords:
+    """A question's keywords as stemmed token tuples indexed by their first token.
+
+    Scoring a transcript tokenizes it once and walks the tokens in a single
+    pass, looking each one up in the index, so the cost is linear in the
+    transcript length regardless of how many keywords the question has.
+    """
+
+    def __init__(self, keywords):
+        self._phrases = {}
+        for keyword in keywords:
+            tokens = tuple(tokenize(str(keyword)))
+            if tokens and tokens not in self._phrases:
+                self._phrases[tokens] = keyword
+        self._starts = {}
+        for tokens in self._phrases:
+            self._starts.setdefault(tokens[0], []).append(tokens)
+
+    def matched(self, transcript):
+        """Keywords found in the transcript, in keyword order"""
+        tokens = tokenize(transcript)
+        found = set()
+        for i, token in enumerate(tokens):
+            for phrase in self._starts.get(token, ()):
+                if phrase not in found and tuple(tokens[i:i + len(phrase)]) == phrase:
+                    found.add(phrase)
+            if len(found) == len(self._phrases):
+                break
+        return [keyword for phrase, keyword in self._phrases.items() if phrase in found]
+
+    def score(self, transcript):
+        """Fraction of keywords present in the transcript (1.0 when there are none)"""
+        if not self._phrases:
+            return 1.0
+        return len(self.matched(transcript)) / len(self._phrases)
+
+
+class KeywordScorer:
+    """Grades speaking answers against each question's expected_keywords.
+
+    The JSON keyword list is parsed and compiled once per question and kept
+    until the question's keyword text changes. A transcript passes when at
+    least SPEAKING_PASS_RATIO of the keywords appear in it.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._compiled = {}
+        self.pass_ratio = 0.5
+
+    def init_app(self, app):
+        self.pass_ratio = app.config['SPEAKING_PASS_RATIO']
+
+    def compiled(self, question):
+        raw = question.expected_keywords or '[]'
+        cached = self._compiled.get(question.id)
+        if cached is not None and cached[0] == raw:
+            return cached[1]
+        
+        try:
+            keywords = json.loads(raw)
+        except ValueError:
+            keywords = raw.split(',')
+        if isinstance(keywords, str):
+            keywords = [keywords]
+        compiled = CompiledKeywords(keywords)
+        with self._lock:
+            self._compiled[question.id] = (raw, compiled)
+        return compiled
+
+    def score(self, question, transcript):
+        return self.compiled(question).score(transcript)
+
+    def score_many(self, question, transcripts):
+        """Scores for many transcripts of one question, compiling its keywords once"""
+        compiled = self.compiled(question)
+        return [compiled.score(transcript) for transcript in transcripts]
+
+    def grade(self, question, transcript):
+        return self.score(question, transcript) >= self.pass_ratio
+
+    def grade_many(self, answers):
+        """Grade (question, transcript) pairs; returns a list of booleans"""
+        return [self.grade(question, transcript) for question, transcript in answers]
+
+    def clear(self):
+        with self._lock:
+            self._compiled = {}
+
+
+keyword_scorer = KeywordScorer()
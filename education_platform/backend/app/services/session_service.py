@@ -0,0 +1,65 @@
+# backend/app/services/session_service.py
+import threading
+
+
+class SessionRegistry:
+    """Active video sessions indexed by room_id and by participant sid.
+
+    Also keeps each teacher's teaching seconds for the current day (keyed by
+    ISO date), seeded from the database once and then advanced as calls end.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._rooms = {}
+        self._sid_rooms = {}
+        self._teaching = {}
+
+    def add(self, room_id, session_data):
+        with self._lock:
+            self._rooms[room_id] = session_data
+            self._sid_rooms[session_data['student_sid']] = room_id
+            self._sid_rooms[session_data['teacher_sid']] = room_id
+
+    def get(self, room_id):
+        return self._rooms.get(room_id)
+
+    def room_for_sid(self, sid):
+        return self._sid_rooms.get(sid)
+
+    def remove(self, room_id):
+        """Remove a room and its sid entries, returning its session data"""
+        with self._lock:
+            session_data = self._rooms.pop(room_id, None)
+            if session_data:
+                for sid in (session_data['student_sid'], session_data['teacher_sid']):
+                    if self._sid_rooms.get(sid) == room_id:
+                        del self._sid_rooms[sid]
+            return session_data
+
+    def teaching_time(self, teacher_id, day):
+        """Seconds taught on `day`, or None if not seeded yet"""
+        entry = self._teaching.get(teacher_id)
+        return entry[1] if entry and entry[0] == day else None
+
+    def seed_teaching_time(self, teacher_id, day, seconds):
+        """Start the day's counter unless one exists already; returns the counter"""
+        with self._lock:
+            entry = self._teaching.get(teacher_id)
+            if not entry or entry[0] != day:
+                entry = self._teaching[teacher_id] = (day, seconds)
+            return entry[1]
+
+    def add_teaching_time(self, teacher_id, day, seconds):
+        """Add an ended call to a seeded counter (an unseeded one is read from the database later)"""
+        with self._lock:
+            entry = self._teaching.get(teacher_id)
+            if entry and entry[0] == day:
+                self._teaching[teacher_id] = (day, entry[1] + seconds)
+
+    def __contains__(self, room_id):
+        return room_id in self._rooms
+
+    def __len__(self):
+        return len(self._rooms)
+
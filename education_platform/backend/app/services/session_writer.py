@@ -0,0 +1,215 @@
+# backend/app/services/session_writer.py
+import atexit
+import json
+import os
+import queue
+import threading
+from datetime import datetime
+from sqlalchemy.exc import OperationalError
+from ..models import db
+from ..models.session import VideoSession
+from ..models.student import Student
+from ..models.teacher import Teacher
+from .counter_service import increment_many
+from .state_backend import state
+
+
+class SessionWriter:
+    """Write-behind persistence for video session start and end records.
+
+    Socket.IO handlers enqueue records after notifying the clients; a single
+    background thread drains the queue in FIFO order and commits each batch
+    in one transaction. A full queue blocks the producer (backpressure) for up
+    to SESSION_WRITER_PUT_TIMEOUT seconds before raising queue.Full.
+
+    Records are never dropped. While the database is unreachable the batch is
+    retried with backoff capped at SESSION_WRITER_MAX_BACKOFF, holding back
+    everything behind it. A record that fails for any other reason, and
+    whatever is still unwritten at shutdown, is appended to
+    SESSION_WRITER_SPILL_PATH. create_app replays it on the next start,
+    before recovery looks for orphaned sessions.
+    """
+
+    def __init__(self):
+        self.app = None
+        self._queue = None
+        self._thread = None
+        self._stopping = threading.Event()
+
+    def init_app(self, app):
+        self.app = app
+        self.batch_size = app.config['SESSION_WRITER_BATCH_SIZE']
+        self.put_timeout = app.config['SESSION_WRITER_PUT_TIMEOUT']
+        self.max_backoff = app.config['SESSION_WRITER_MAX_BACKOFF']
+        self.spill_path = app.config['SESSION_WRITER_SPILL_PATH']
+        self._queue = queue.Queue(maxsize=app.config['SESSION_WRITER_QUEUE_SIZE'])
+        self._thread = threading.Thread(target=self._run, name='session-writer', daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+
+    def session_started(self, room_id, student_id, teacher_id, start_time):
+        self._queue.put(('start', {
+            'room_id': room_id,
+            'student_id': student_id,
+            'teacher_id': teacher_id,
+            'start_time': start_time,
+            'created_at': start_time,
+            'status': 'active',
+            'worker_id': state.worker_id
+        }), timeout=self.put_timeout)
+
+    def session_resumed(self, room_id):
+        """Hand a recovered room to this process so it is not closed as orphaned"""
+        self._queue.put(('resume', {
+            'room_id': room_id,
+            'worker_id': state.worker_id
+        }), timeout=self.put_timeout)
+
+    def session_ended(self, room_id, student_id, teacher_id, end_time, duration, status='completed'):
+        self._queue.put(('end', {
+            'room_id': room_id,
+            'student_id': student_id,
+            'teacher_id': teacher_id,
+            'end_time': end_time,
+            'duration': duration,
+            'status': status
+        }), timeout=self.put_timeout)
+
+    def flush(self):
+        """Block until every queued record has been written"""
+        if self._queue is not None:
+            self._queue.join()
+
+    def stop(self):
+        """Flush pending records (spilling them if the database is down) and stop the writer thread"""
+        if self._thread is None or not self._thread.is_alive():
+            return
+        self._stopping.set()
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            record = self._queue.get()
+            batch = [record]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            records = [r for r in batch if r is not None]
+            if records:
+                with self.app.app_context():
+                    self._write_with_retry(records)
+
+            for _ in batch:
+                self._queue.task_done()
+            if len(records) < len(batch):
+                return
+
+    def _write_with_retry(self, records):
+        delay = 0.5
+        while True:
+            try:
+                self._write(records)
+                return
+            except OperationalError as e:
+                db.session.rollback()
+                if self._stopping.is_set():
+                    self._spill(records)
+                    return
+                print(f'Session writer batch failed, retrying in {delay:.1f}s: {str(e)}')
+                self._stopping.wait(delay)
+                delay = min(delay * 2, self.max_backoff)
+            except Exception as e:
+                db.session.rollback()
+                if len(records) == 1:
+                    print(f'Session writer spilled a record to {self.spill_path}: {str(e)}')
+                    self._spill(records)
+                    return
+                # Isolate the failing record; the others are still written in order
+                for record in records:
+                    self._write_with_retry([record])
+                return
+
+    def _spill(self, records):
+        with open(self.spill_path, 'a') as f:
+            for kind, data in records:
+                f.write(json.dumps({'kind': kind, 'data': {
+                    key: value.isoformat() if isinstance(value, datetime) else value
+                    for key, value in data.items()
+                }}) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+    def replay(self):
+        """Write the records spilled by a previous process; call inside an app context.
+
+        Replayed starts keep the worker_id of the process that spilled them,
+        which is no longer live, so recovery treats them as orphaned.
+        """
+        # Rename first so only one process replays a shared spill file
+        claimed = f'{self.spill_path}.{os.getpid()}'
+        try:
+            os.replace(self.spill_path, claimed)
+        except FileNotFoundError:
+            return
+
+        records = []
+        with open(claimed) as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    data = record['data']
+                    for key in ('start_time', 'end_time', 'created_at'):
+                        if data.get(key):
+                            data[key] = datetime.fromisoformat(data[key])
+                    records.append((record['kind'], data))
+
+        for start in range(0, len(records), self.batch_size):
+            self._write_with_retry(records[start:start + self.batch_size])
+        os.remove(claimed)
+        print(f'Session writer replayed {len(records)} spilled records')
+
+    def _write(self, records):
+        starts = [data for kind, data in records if kind == 'start']
+        resumes = [data for kind, data in records if kind == 'resume']
+        ends = [data for kind, data in records if kind == 'end']
+
+        # Starts and resumes always precede their own end in the queue, so
+        # applying them first keeps per-room ordering inside the batch
+        if starts:
+            db.session.bulk_insert_mappings(VideoSession, starts)
+
+        for data in resumes:
+            VideoSession.query.filter_by(room_id=data['room_id'], status='active').update({
+                'worker_id': data['worker_id']
+            }, synchronize_session=False)
+
+        # A room closed by recovery in the meantime is neither updated nor credited again
+        closed = []
+        for data in ends:
+            updated = VideoSession.query.filter_by(room_id=data['room_id'], status='active').update({
+                'end_time': data['end_time'],
+                'duration': data['duration'],
+                'status': data['status']
+            }, synchronize_session=False)
+            if updated:
+                closed.append(data)
+        ends = closed
+
+        if ends:
+            student_time = {}
+            teacher_time = {}
+            for data in ends:
+                student_time[data['student_id']] = student_time.get(data['student_id'], 0) + data['duration']
+                teacher_time[data['teacher_id']] = teacher_time.get(data['teacher_id'], 0) + data['duration']
+
+            increment_many(Student, 'total_video_time', student_time)
+            increment_many(Teacher, 'total_teaching_time', teacher_time)
+
+        db.session.commit()
+
+
+session_writer = SessionWriter()
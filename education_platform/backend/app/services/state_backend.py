@@ -0,0 +1,329 @@
+# backend/app/services/state_backend.py
+import atexit
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+from .matching_service import MatchingService, FifoPolicy, create_policy
+from .session_service import SessionRegistry
+
+
+def _add_match_queue_score(conn):
+    # state.db files created before scoring have a match_queue without score
+    columns = {row[1] for row in conn.execute('PRAGMA table_info(match_queue)')}
+    if 'score' not in columns:
+        conn.execute('ALTER TABLE match_queue ADD COLUMN score REAL NOT NULL DEFAULT 0')
+    conn.execute('CREATE INDEX IF NOT EXISTS ix_match_queue_role_score ON match_queue (role, score, seq)')
+
+
+# PRAGMA user_version N means the first N steps have been applied
+_MIGRATIONS = [
+    '''
+        CREATE TABLE IF NOT EXISTS match_queue (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            role TEXT NOT NULL,
+            sid TEXT NOT NULL UNIQUE,
+            data TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS active_sessions (
+            room_id TEXT PRIMARY KEY,
+            student_sid TEXT NOT NULL,
+            teacher_sid TEXT NOT NULL,
+            data TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS ix_active_sessions_student_sid ON active_sessions (student_sid);
+        CREATE INDEX IF NOT EXISTS ix_active_sessions_teacher_sid ON active_sessions (teacher_sid);
+    ''',
+    _add_match_queue_score,
+    '''
+        ALTER TABLE match_queue ADD COLUMN owner TEXT NOT NULL DEFAULT '';
+        ALTER TABLE active_sessions ADD COLUMN owner TEXT NOT NULL DEFAULT '';
+        CREATE INDEX ix_match_queue_owner ON match_queue (owner);
+        CREATE INDEX ix_active_sessions_owner ON active_sessions (owner);
+        CREATE TABLE workers (
+            owner TEXT PRIMARY KEY,
+            heartbeat REAL NOT NULL
+        );
+    ''',
+    '''
+        CREATE TABLE teaching_time (
+            teacher_id INTEGER PRIMARY KEY,
+            day TEXT NOT NULL,
+            seconds INTEGER NOT NULL
+        );
+    ''',
+]
+
+
+class SQLiteStore:
+    """Per-thread connections to a SQLite file shared by every worker process.
+
+    Rows in match_queue and active_sessions are tagged with the worker that
+    wrote them. Each worker heartbeats into the workers table; rows of a
+    worker silent for longer than worker_timeout (a crashed or restarted
+    process) are deleted by whichever worker expires it next.
+    """
+
+    def __init__(self, path, owner, worker_timeout=30):
+        self.path = path
+        self.owner = owner
+        self.worker_timeout = worker_timeout
+        self._local = threading.local()
+        conn = self.connection()
+        conn.execute('PRAGMA journal_mode=WAL')
+        self._migrate()
+
+    def _migrate(self):
+        with self.transaction() as conn:
+            version = conn.execute('PRAGMA user_version').fetchone()[0]
+            for step in _MIGRATIONS[version:]:
+                if callable(step):
+                    step(conn)
+                else:
+                    for statement in step.split(';'):
+                        if statement.strip():
+                            conn.execute(statement)
+            # PRAGMA does not take parameters
+            conn.execute(f'PRAGMA user_version = {len(_MIGRATIONS)}')
+
+    def connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA busy_timeout=30000')
+            self._local.conn = conn
+        return conn
+
+    def transaction(self):
+        """Context manager holding the write lock so read-then-write steps are atomic across processes"""
+        return _Transaction(self.connection())
+
+    def heartbeat(self):
+        self.connection().execute(
+            'INSERT INTO workers (owner, heartbeat) VALUES (?, ?) '
+            'ON CONFLICT (owner) DO UPDATE SET heartbeat = excluded.heartbeat',
+            (self.owner, time.time())
+        )
+
+    def live_workers(self):
+        rows = self.connection().execute(
+            'SELECT owner FROM workers WHERE heartbeat >= ?', (time.time() - self.worker_timeout,)
+        )
+        return {owner for (owner,) in rows}
+
+    def expire_workers(self):
+        """Forget silent workers and delete the queue entries and rooms they left behind"""
+        with self.transaction() as conn:
+            conn.execute('DELETE FROM workers WHERE heartbeat < ?', (time.time() - self.worker_timeout,))
+            queued = conn.execute(
+                'DELETE FROM match_queue WHERE owner NOT IN (SELECT owner FROM workers)').rowcount
+            rooms = conn.execute(
+                'DELETE FROM active_sessions WHERE owner NOT IN (SELECT owner FROM workers)').rowcount
+        if queued or rooms:
+            print(f'Cleared {queued} queue entries and {rooms} rooms left by stopped workers')
+
+    def retire(self):
+        """Remove this worker and its rows on a clean shutdown"""
+        with self.transaction() as conn:
+            conn.execute('DELETE FROM match_queue WHERE owner = ?', (self.owner,))
+            conn.execute('DELETE FROM active_sessions WHERE owner = ?', (self.owner,))
+            conn.execute('DELETE FROM workers WHERE owner = ?', (self.owner,))
+
+
+class _Transaction:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        self.conn.execute('BEGIN IMMEDIATE')
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        self.conn.execute('ROLLBACK' if exc_type else 'COMMIT')
+        return False
+
+
+def _dumps(data):
+    data = dict(data)
+    for key, value in data.items():
+        if isinstance(value, datetime):
+            data[key] = {'__datetime__': value.isoformat()}
+    return json.dumps(data)
+
+
+def _loads(text):
+    data = json.loads(text)
+    for key, value in data.items():
+        if isinstance(value, dict) and '__datetime__' in value:
+            data[key] = datetime.fromisoformat(value['__datetime__'])
+    return data
+
+
+class SQLiteMatchingService:
+    """MatchingService backed by a SQLite file so workers share one queue"""
+
+    def __init__(self, store, policy=None):
+        self.store = store
+        self.policy = policy or FifoPolicy()
+
+    def _match_or_push(self, sid, data, score, role, other_role):
+        with self.store.transaction() as conn:
+            if conn.execute('SELECT 1 FROM match_queue WHERE sid = ?', (sid,)).fetchone():
+                return None
+            row = conn.execute(
+                'SELECT seq, sid, data FROM match_queue WHERE role = ? ORDER BY score, seq LIMIT 1',
+                (other_role,)
+            ).fetchone()
+            if row is None:
+                conn.execute(
+                    'INSERT INTO match_queue (role, sid, score, data, owner) VALUES (?, ?, ?, ?, ?)',
+                    (role, sid, score, json.dumps(data), self.store.owner)
+                )
+                return None
+            conn.execute('DELETE FROM match_queue WHERE seq = ?', (row[0],))
+            return row[1], json.loads(row[2])
+
+    def student_join(self, student_sid, student_data):
+        score = self.policy.student_score(student_data)
+        return self._match_or_push(student_sid, student_data, score, 'student', 'teacher')
+
+    def teacher_available(self, teacher_sid, teacher_data):
+        score = self.policy.teacher_score(teacher_data)
+        return self._match_or_push(teacher_sid, teacher_data, score, 'teacher', 'student')
+
+    def remove(self, sid):
+        self.store.connection().execute('DELETE FROM match_queue WHERE sid = ?', (sid,))
+
+    def _count(self, role):
+        return self.store.connection().execute(
+            'SELECT COUNT(*) FROM match_queue WHERE role = ?', (role,)
+        ).fetchone()[0]
+
+    def waiting_count(self):
+        return self._count('student')
+
+    def available_count(self):
+        return self._count('teacher')
+
+
+class SQLiteSessionRegistry:
+    """SessionRegistry backed by a SQLite file so any worker can end a call"""
+
+    def __init__(self, store):
+        self.store = store
+
+    def add(self, room_id, session_data):
+        self.store.connection().execute(
+            'INSERT OR REPLACE INTO active_sessions (room_id, student_sid, teacher_sid, data, owner) '
+            'VALUES (?, ?, ?, ?, ?)',
+            (room_id, session_data['student_sid'], session_data['teacher_sid'], _dumps(session_data),
+             self.store.owner)
+        )
+
+    def get(self, room_id):
+        row = self.store.connection().execute(
+            'SELECT data FROM active_sessions WHERE room_id = ?', (room_id,)
+        ).fetchone()
+        return _loads(row[0]) if row else None
+
+    def room_for_sid(self, sid):
+        row = self.store.connection().execute(
+            'SELECT room_id FROM active_sessions WHERE student_sid = ? '
+            'UNION ALL SELECT room_id FROM active_sessions WHERE teacher_sid = ? LIMIT 1',
+            (sid, sid)
+        ).fetchone()
+        return row[0] if row else None
+
+    def remove(self, room_id):
+        with self.store.transaction() as conn:
+            row = conn.execute(
+                'SELECT data FROM active_sessions WHERE room_id = ?', (room_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute('DELETE FROM active_sessions WHERE room_id = ?', (room_id,))
+            return _loads(row[0])
+
+    def teaching_time(self, teacher_id, day):
+        row = self.store.connection().execute(
+            'SELECT seconds FROM teaching_time WHERE teacher_id = ? AND day = ?', (teacher_id, day)
+        ).fetchone()
+        return row[0] if row else None
+
+    def seed_teaching_time(self, teacher_id, day, seconds):
+        with self.store.transaction() as conn:
+            conn.execute(
+                'INSERT INTO teaching_time (teacher_id, day, seconds) VALUES (?, ?, ?) '
+                'ON CONFLICT (teacher_id) DO UPDATE SET day = excluded.day, seconds = excluded.seconds '
+                'WHERE day != excluded.day',
+                (teacher_id, day, seconds)
+            )
+            return conn.execute(
+                'SELECT seconds FROM teaching_time WHERE teacher_id = ?', (teacher_id,)
+            ).fetchone()[0]
+
+    def add_teaching_time(self, teacher_id, day, seconds):
+        self.store.connection().execute(
+            'UPDATE teaching_time SET seconds = seconds + ? WHERE teacher_id = ? AND day = ?',
+            (seconds, teacher_id, day)
+        )
+
+    def __contains__(self, room_id):
+        return self.get(room_id) is not None
+
+    def __len__(self):
+        return self.store.connection().execute('SELECT COUNT(*) FROM active_sessions').fetchone()[0]
+
+
+class StateBackend:
+    """Holds the matching queue and session registry used by the Socket.IO handlers.
+
+    STATE_BACKEND='memory' keeps everything in this process. STATE_BACKEND='sqlite'
+    shares it between worker processes on the same host through STATE_DB_PATH.
+    worker_id identifies this process (a fresh id on every start).
+    """
+
+    def __init__(self):
+        self.worker_id = uuid.uuid4().hex
+        self.matching = MatchingService()
+        self.sessions = SessionRegistry()
+        self.store = None
+
+    def init_app(self, app):
+        backend = app.config.get('STATE_BACKEND', 'memory')
+        policy = create_policy(app.config)
+        if backend == 'sqlite':
+            self.store = SQLiteStore(app.config['STATE_DB_PATH'], self.worker_id,
+                                     app.config['STATE_WORKER_TIMEOUT_SECONDS'])
+            self.matching = SQLiteMatchingService(self.store, policy)
+            self.sessions = SQLiteSessionRegistry(self.store)
+            self.store.heartbeat()
+            self.store.expire_workers()
+            thread = threading.Thread(target=self._run, name='state-heartbeat', daemon=True)
+            thread.start()
+            atexit.register(self.store.retire)
+        elif backend == 'memory':
+            self.matching = MatchingService(policy)
+            self.sessions = SessionRegistry()
+        else:
+            raise ValueError(f'Unknown STATE_BACKEND: {backend}')
+
+    def live_workers(self):
+        """Ids of the worker processes currently sharing this state"""
+        if self.store is None:
+            return {self.worker_id}
+        return self.store.live_workers() | {self.worker_id}
+
+    def _run(self):
+        while True:
+            time.sleep(self.store.worker_timeout / 3)
+            try:
+                self.store.heartbeat()
+                self.store.expire_workers()
+            except Exception as e:
+                print(f'Error in state heartbeat: {str(e)}')
+
+
+state = StateBackend()
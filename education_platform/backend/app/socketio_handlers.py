@@ -1,47 +1,118 @@
 # backend/app/socketio_handlers.py
-from flask_socketio import emit, join_room, leave_room, disconnect
+from flask_socketio import emit as socketio_emit, join_room, leave_room, disconnect
 from flask import request
+from sqlalchemy import func
 from .models import db
 from .models.user import User
-from .models.student import Student
-from .models.teacher import Teacher
 from .models.session import VideoSession
 from . import socketio
+from .services.state_backend import state
+from .services.session_writer import session_writer
+from .services.metrics_service import metrics
+from .services.presence_service import presence
+from .services.recovery_service import recovery
 from datetime import datetime
 import uuid
 
-# Store active users
-waiting_students = []
-available_teachers = {}
-active_sessions = {}
+metrics.gauge('waiting_students', lambda: state.matching.waiting_count())
+metrics.gauge('available_teachers', lambda: state.matching.available_count())
+metrics.gauge('active_sessions', lambda: len(state.sessions))
+metrics.gauge('tracked_clients', lambda: presence.tracked_count())
+
+
+def emit(event, *args, **kwargs):
+    # Count emits (and error replies) against the handler currently running
+    metrics.record_emit(is_error=(event == 'error'))
+    return socketio_emit(event, *args, **kwargs)
+
 
 @socketio.on('connect')
+@metrics.instrument('connect')
 def handle_connect():
     print(f'Client connected: {request.sid}')
+    presence.touch(request.sid)
     emit('connected', {'sid': request.sid})
 
 
+@socketio.on('heartbeat')
+@metrics.instrument('heartbeat')
+def handle_heartbeat(data=None):
+    presence.touch(request.sid)
+
+
 @socketio.on('disconnect')
+@metrics.instrument('disconnect')
 def handle_disconnect():
     print(f'Client disconnected: {request.sid}')
+    presence.forget(request.sid)
     
     # Remove from waiting lists
-    global waiting_students, available_teachers
+    state.matching.remove(request.sid)
+    
+    # End the session this client was in, if any
+    room_id = state.sessions.room_for_sid(request.sid)
+    if room_id:
+        handle_end_call({'room_id': room_id})
+
+
+def start_session(student_sid, student_data, teacher_sid, teacher_data):
+    # Create room
+    room_id = str(uuid.uuid4())
+    start_time = datetime.utcnow()
+    
+    # Store active session
+    state.sessions.add(room_id, {
+        'student_sid': student_sid,
+        'teacher_sid': teacher_sid,
+        'student_id': student_data['student_id'],
+        'teacher_id': teacher_data['teacher_id'],
+        'start_time': start_time
+    })
     
-    if request.sid in waiting_students:
-        waiting_students.remove(request.sid)
+    # Join both to room
+    join_room(room_id, sid=student_sid)
+    join_room(room_id, sid=teacher_sid)
     
-    if request.sid in available_teachers:
-        del available_teachers[request.sid]
+    # Notify both parties
+    emit('match_found', {
+        'room_id': room_id,
+        'partner_type': 'teacher',
+        'partner_name': teacher_data['teacher_name']
+    }, room=student_sid)
     
-    # Handle active session cleanup
-    for room_id, session_data in list(active_sessions.items()):
-        if request.sid in [session_data.get('student_sid'), session_data.get('teacher_sid')]:
-            # End the session
-            handle_end_call({'room_id': room_id})
+    emit('match_found', {
+        'room_id': room_id,
+        'partner_type': 'student',
+        'partner_name': student_data['student_name']
+    }, room=teacher_sid)
+    
+    # Persist the session row in the background
+    session_writer.session_started(room_id, student_data['student_id'], teacher_data['teacher_id'], start_time)
+    
+    print(f'Matched: Student {student_data["student_name"]} with Teacher {teacher_data["teacher_name"]}')
+
+
+def teaching_time_today(teacher_id):
+    # Summed from the database once per teacher and day, then kept up to date by call_ended
+    midnight = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    day = midnight.date().isoformat()
+    seconds = state.sessions.teaching_time(teacher_id, day)
+    if seconds is None:
+        seconds = db.session.query(func.coalesce(func.sum(VideoSession.duration), 0)).filter(
+            VideoSession.teacher_id == teacher_id,
+            VideoSession.start_time >= midnight
+        ).scalar()
+        seconds = state.sessions.seed_teaching_time(teacher_id, day, seconds)
+    return seconds
+
+
+def count_teaching_time(session_data, duration):
+    day = session_data['start_time'].date().isoformat()
+    state.sessions.add_teaching_time(session_data['teacher_id'], day, duration)
 
 
 @socketio.on('student_join_queue')
+@metrics.instrument('student_join_queue')
 def handle_student_join_queue(data):
     try:
         user_id = data.get('user_id')
@@ -54,63 +125,22 @@ def handle_student_join_queue(data):
             return
         
         student = user.student_profile
+        student_data = {
+            'student_id': student.id,
+            'student_name': student.name,
+            'training_progress': student.training_progress
+        }
         
         print(f'Student {student.name} joined queue')
         
-        # Check if there's an available teacher
-        if available_teachers:
-            # Match with first available teacher
-            teacher_sid, teacher_data = available_teachers.popitem()
-            
-            # Create room
-            room_id = str(uuid.uuid4())
-            
-            # Create session in database
-            session = VideoSession(
-                student_id=student.id,
-                teacher_id=teacher_data['teacher_id'],
-                room_id=room_id,
-                status='active'
-            )
-            db.session.add(session)
-            db.session.commit()
-            
-            # Store active session
-            active_sessions[room_id] = {
-                'session_id': session.id,
-                'student_sid': student_sid,
-                'teacher_sid': teacher_sid,
-                'student_id': student.id,
-                'teacher_id': teacher_data['teacher_id'],
-                'start_time': datetime.utcnow()
-            }
-            
-            # Join both to room
-            join_room(room_id, sid=student_sid)
-            join_room(room_id, sid=teacher_sid)
-            
-            # Notify both parties
-            emit('match_found', {
-                'room_id': room_id,
-                'session_id': session.id,
-                'partner_type': 'teacher',
-                'partner_name': teacher_data['teacher_name']
-            }, room=student_sid)
-            
-            emit('match_found', {
-                'room_id': room_id,
-                'session_id': session.id,
-                'partner_type': 'student',
-                'partner_name': student.name
-            }, room=teacher_sid)
-            
-            print(f'Matched: Student {student.name} with Teacher {teacher_data["teacher_name"]}')
+        # Match with the next teacher picked by the matching policy, or join the queue
+        match = state.matching.student_join(student_sid, student_data)
+        if match:
+            teacher_sid, teacher_data = match
+            start_session(student_sid, student_data, teacher_sid, teacher_data)
         else:
-            # Add to waiting queue
-            if student_sid not in waiting_students:
-                waiting_students.append(student_sid)
-                emit('waiting', {'message': 'Waiting for teacher...'})
-                print(f'Student added to queue. Queue size: {len(waiting_students)}')
+            emit('waiting', {'message': 'Waiting for teacher...'})
+            print(f'Student added to queue. Queue size: {state.matching.waiting_count()}')
     
     except Exception as e:
         print(f'Error in student_join_queue: {str(e)}')
@@ -118,6 +148,7 @@ def handle_student_join_queue(data):
 
 
 @socketio.on('teacher_available')
+@metrics.instrument('teacher_available')
 def handle_teacher_available(data):
     try:
         user_id = data.get('user_id')
@@ -130,46 +161,37 @@ def handle_teacher_available(data):
             return
         
         teacher = user.teacher_profile
+        teacher_data = {
+            'teacher_id': teacher.id,
+            'teacher_name': teacher.name,
+            'teaching_time_today': teaching_time_today(teacher.id)
+        }
         
         print(f'Teacher {teacher.name} is available')
         
-        # Check if there's a waiting student
-        if waiting_students:
-            # Match with first waiting student
-            student_sid = waiting_students.pop(0)
-            
-            # Get student info from socket
-            # Note: In production, you'd want to pass student_id with the socket connection
-            # For now, we'll emit back to get student info
-            
-            # Create room
-            room_id = str(uuid.uuid4())
-            
-            # We need student_id, so let's store teacher as available for now
-            available_teachers[teacher_sid] = {
-                'teacher_id': teacher.id,
-                'teacher_name': teacher.name
-            }
-            
-            # Notify student to send their info
-            emit('teacher_ready', {'teacher_sid': teacher_sid}, room=student_sid)
+        # Match with the next student picked by the matching policy, or mark as available
+        match = state.matching.teacher_available(teacher_sid, teacher_data)
+        if match:
+            student_sid, student_data = match
+            start_session(student_sid, student_data, teacher_sid, teacher_data)
         else:
-            # Add to available teachers
-            available_teachers[teacher_sid] = {
-                'teacher_id': teacher.id,
-                'teacher_name': teacher.name
-            }
             emit('waiting', {'message': 'Waiting for student...'})
-            print(f'Teacher added to available. Available count: {len(available_teachers)}')
+            print(f'Teacher added to available. Available count: {state.matching.available_count()}')
     
     except Exception as e:
         print(f'Error in teacher_available: {str(e)}')
         emit('error', {'message': str(e)})
 
 
+def relay_room(data):
+    # Prefer the room the sender is registered in over the client supplied one
+    return state.sessions.room_for_sid(request.sid) or data.get('room_id')
+
+
 @socketio.on('webrtc_offer')
+@metrics.instrument('webrtc_offer')
 def handle_webrtc_offer(data):
-    room_id = data.get('room_id')
+    room_id = relay_room(data)
     offer = data.get('offer')
     
     # Send offer to other peer in the room
@@ -177,8 +199,9 @@ def handle_webrtc_offer(data):
 
 
 @socketio.on('webrtc_answer')
+@metrics.instrument('webrtc_answer')
 def handle_webrtc_answer(data):
-    room_id = data.get('room_id')
+    room_id = relay_room(data)
     answer = data.get('answer')
     
     # Send answer to other peer in the room
@@ -186,8 +209,9 @@ def handle_webrtc_answer(data):
 
 
 @socketio.on('webrtc_ice_candidate')
+@metrics.instrument('webrtc_ice_candidate')
 def handle_ice_candidate(data):
-    room_id = data.get('room_id')
+    room_id = relay_room(data)
     candidate = data.get('candidate')
     
     # Send ICE candidate to other peer
@@ -195,37 +219,22 @@ def handle_ice_candidate(data):
 
 
 @socketio.on('end_call')
+@metrics.instrument('end_call')
 def handle_end_call(data):
     try:
         room_id = data.get('room_id')
         
-        if room_id not in active_sessions:
+        # Remove first so a second hang-up for the same room is a no-op
+        session_data = state.sessions.remove(room_id)
+        if not session_data:
             emit('error', {'message': 'Session not found'})
             return
         
-        session_data = active_sessions[room_id]
-        
         # Calculate duration
         end_time = datetime.utcnow()
         start_time = session_data['start_time']
         duration = int((end_time - start_time).total_seconds())
         
-        # Update database
-        session = VideoSession.query.get(session_data['session_id'])
-        session.end_time = end_time
-        session.duration = duration
-        session.status = 'completed'
-        
-        # Update student video time
-        student = Student.query.get(session_data['student_id'])
-        student.total_video_time += duration
-        
-        # Update teacher teaching time
-        teacher = Teacher.query.get(session_data['teacher_id'])
-        teacher.total_teaching_time += duration
-        
-        db.session.commit()
-        
         # Notify both parties
         emit('call_ended', {
             'duration': duration,
@@ -235,7 +244,16 @@ def handle_end_call(data):
         # Clean up
         leave_room(room_id, sid=session_data['student_sid'])
         leave_room(room_id, sid=session_data['teacher_sid'])
-        del active_sessions[room_id]
+        
+        # Close the session row and credit video/teaching time in the background
+        count_teaching_time(session_data, duration)
+        session_writer.session_ended(
+            room_id,
+            session_data['student_id'],
+            session_data['teacher_id'],
+            end_time,
+            duration
+        )
         
         print(f'Session ended. Duration: {duration}s')
     
@@ -244,17 +262,84 @@ def handle_end_call(data):
         emit('error', {'message': str(e)})
 
 
+@socketio.on('resume_session')
+@metrics.instrument('resume_session')
+def handle_resume_session(data):
+    try:
+        room_id = data.get('room_id')
+        user = User.query.get(data.get('user_id'))
+        if not user or user.role not in ('student', 'teacher'):
+            emit('error', {'message': 'Invalid user'})
+            return
+        
+        profile = user.student_profile if user.role == 'student' else user.teacher_profile
+        resumed = recovery.resume(room_id, user.role, profile.id, request.sid)
+        if not resumed:
+            emit('error', {'message': 'Session not found'})
+            return
+        
+        session_data, complete = resumed
+        join_room(room_id)
+        
+        if complete:
+            # Both peers are back: the room is live again
+            state.sessions.add(room_id, session_data)
+            session_writer.session_resumed(room_id)
+            emit('session_resumed', {'room_id': room_id}, room=room_id)
+            print(f'Session resumed: {room_id}')
+        else:
+            emit('waiting', {'message': 'Waiting for partner to reconnect...'})
+    
+    except Exception as e:
+        print(f'Error in resume_session: {str(e)}')
+        emit('error', {'message': str(e)})
+
+
+@presence.expired_handler
+def reap_stale_clients(sids):
+    # Clients that stopped sending heartbeats without a clean disconnect
+    end_time = datetime.utcnow()
+    for sid in sids:
+        state.matching.remove(sid)
+        
+        room_id = state.sessions.room_for_sid(sid)
+        session_data = state.sessions.remove(room_id) if room_id else None
+        if not session_data:
+            continue
+        
+        duration = int((end_time - session_data['start_time']).total_seconds())
+        socketio.emit('call_ended', {
+            'duration': duration,
+            'message': 'Partner connection lost'
+        }, room=room_id)
+        socketio.close_room(room_id)
+        
+        count_teaching_time(session_data, duration)
+        session_writer.session_ended(
+            room_id,
+            session_data['student_id'],
+            session_data['teacher_id'],
+            end_time,
+            duration,
+            status='terminated'
+        )
+    
+    print(f'Reaped {len(sids)} stale clients')
+
+
 @socketio.on('toggle_audio')
+@metrics.instrument('toggle_audio')
 def handle_toggle_audio(data):
-    room_id = data.get('room_id')
+    room_id = relay_room(data)
     audio_enabled = data.get('audio_enabled')
     
     emit('peer_audio_toggle', {'audio_enabled': audio_enabled}, room=room_id, include_self=False)
 
 
 @socketio.on('toggle_video')
+@metrics.instrument('toggle_video')
 def handle_toggle_video(data):
-    room_id = data.get('room_id')
+    room_id = relay_room(data)
     video_enabled = data.get('video_enabled')
     
     emit('peer_video_toggle', {'video_enabled': video_enabled}, room=room_id, include_self=False)
\ No newline at end of file
@@ -1,16 +1,25 @@
 # backend/app/utils/decorators.py
+import hmac
 from functools import wraps
-from flask import jsonify
-from flask_jwt_extended import verify_jwt_in_request, get_jwt_identity
-from ..models.user import User
+from flask import jsonify, request, current_app
+from flask_jwt_extended import verify_jwt_in_request, get_jwt
+from .identity import load_current_user
+
+def caller_role():
+    """Role of the caller from the token claims; older tokens without claims fall back to the DB"""
+    claims = get_jwt()
+    if 'role' not in claims:
+        user = load_current_user()
+        return user.role if user and user.is_active else None
+    if not claims.get('is_active', True):
+        return None
+    return claims['role']
 
 def student_required(fn):
     @wraps(fn)
     def wrapper(*args, **kwargs):
         verify_jwt_in_request()
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
-        if not user or user.role != 'student':
+        if caller_role() != 'student':
             return jsonify({'error': 'Student access required'}), 403
         return fn(*args, **kwargs)
     return wrapper
@@ -19,13 +28,22 @@ def teacher_required(fn):
     @wraps(fn)
     def wrapper(*args, **kwargs):
         verify_jwt_in_request()
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
-        if not user or user.role != 'teacher':
+        if caller_role() != 'teacher':
             return jsonify({'error': 'Teacher access required'}), 403
         return fn(*args, **kwargs)
     return wrapper
 
+def admin_required(fn):
+    """Requires the X-Admin-Key header to match ADMIN_API_KEY; disabled when no key is set"""
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        expected = current_app.config.get('ADMIN_API_KEY')
+        provided = request.headers.get('X-Admin-Key', '')
+        if not expected or not hmac.compare_digest(provided, expected):
+            return jsonify({'error': 'Admin access required'}), 403
+        return fn(*args, **kwargs)
+    return wrapper
+
 
 # All blueprints will be imported here
 
@@ -0,0 +1,38 @@
+# backend/app/utils/identity.py
+from flask import g
+from flask_jwt_extended import get_jwt_identity, get_jwt
+from sqlalchemy.orm import joinedload
+from werkzeug.local import LocalProxy
+from ..models import db
+from ..models.user import User
+from ..models.student import Student
+from ..models.teacher import Teacher
+
+def load_current_user():
+    """Load the JWT user with its profile in one query, cached on flask.g for the request"""
+    if '_current_user' not in g:
+        g._current_user = User.query.options(
+            joinedload(User.student_profile),
+            joinedload(User.teacher_profile)
+        ).filter_by(id=int(get_jwt_identity())).first()
+    return g._current_user
+
+
+def _load_profile(role):
+    # Tokens carrying a profile id claim only need a primary key lookup
+    claims = get_jwt()
+    if claims.get('role') == role and claims.get(f'{role}_id') is not None:
+        if '_current_profile' not in g:
+            model = Student if role == 'student' else Teacher
+            g._current_profile = db.session.get(model, claims[f'{role}_id'])
+        return g._current_profile
+    
+    user = load_current_user()
+    if not user or user.role != role:
+        return None
+    return user.student_profile if role == 'student' else user.teacher_profile
+
+
+current_user = LocalProxy(load_current_user)
+current_student = LocalProxy(lambda: _load_profile('student'))
+current_teacher = LocalProxy(lambda: _load_profile('teacher'))
@@ -0,0 +1,108 @@
+# backend/app/utils/pagination.py
+import base64
+import json
+import threading
+import time
+from datetime import datetime
+from flask import request, current_app
+from sqlalchemy import and_, or_
+
+# Keyset pagination: lists are ordered newest first by (created_at, id) and a
+# page continues strictly after the last row of the previous one, so every
+# page is an index range scan regardless of depth. Clients pass the opaque
+# next_cursor back as ?cursor=...
+
+MAX_PER_PAGE = 100
+TOTAL_CACHE_SECONDS = 60
+TOTAL_CACHE_MAX_ENTRIES = 10000
+
+_totals = {}
+_totals_lock = threading.Lock()
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(created_at, row_id, source=0):
+    values = [created_at.isoformat(), row_id] + ([source] if source else [])
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """(created_at, id, source) from a cursor; source is 0 for single-table lists"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        created_at, row_id, *source = json.loads(raw)
+        return datetime.fromisoformat(created_at), int(row_id), int(source[0]) if source else 0
+    except (ValueError, TypeError, IndexError):
+        raise InvalidCursor('Invalid cursor')
+
+
+def cached_total(cache_key, query):
+    """COUNT(*) of the query, reused for TOTAL_CACHE_SECONDS per cache key"""
+    now = time.monotonic()
+    cached = _totals.get(cache_key)
+    if cached and now - cached[1] < TOTAL_CACHE_SECONDS:
+        return cached[0]
+    
+    total = query.order_by(None).count()
+    with _totals_lock:
+        if len(_totals) >= TOTAL_CACHE_MAX_ENTRIES:
+            _totals.clear()
+        _totals[cache_key] = (total, now)
+    return total
+
+
+def _after(model, source, cursor):
+    # Rows strictly after the cursor in (created_at desc, source asc, id desc) order
+    created_at, row_id, cursor_source = cursor
+    if source > cursor_source:
+        tie = model.created_at == created_at
+    elif source == cursor_source:
+        tie = and_(model.created_at == created_at, model.id < row_id)
+    else:
+        return model.created_at < created_at
+    return or_(model.created_at < created_at, tie)
+
+
+def keyset_page(query, model, cache_key=None):
+    """One page of `query` newest first, driven by ?cursor=, ?per_page= and ?include_total=true.
+
+    Returns {'items', 'next_cursor', 'has_more'} plus 'total' when requested
+    (needs a cache_key). Raises InvalidCursor for a malformed cursor.
+    """
+    return merged_keyset_page([(query, model)], cache_key)
+
+
+def merged_keyset_page(sources, cache_key=None):
+    """Like keyset_page, interleaving several (query, model) sources by created_at.
+
+    Each source is read with its own bounded index scan and the results are
+    merged in Python; ties on created_at go to the earlier source.
+    """
+    per_page = request.args.get('per_page', current_app.config['ITEMS_PER_PAGE'], type=int)
+    per_page = max(1, min(per_page, MAX_PER_PAGE))
+    cursor = request.args.get('cursor')
+    cursor = decode_cursor(cursor) if cursor else None
+    
+    rows = []
+    for source, (query, model) in enumerate(sources):
+        page_query = query.filter(_after(model, source, cursor)) if cursor else query
+        for item in page_query.order_by(model.created_at.desc(), model.id.desc()).limit(per_page + 1):
+            rows.append((item.created_at, -source, item.id, item))
+    rows.sort(key=lambda row: row[:3], reverse=True)
+    
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    last = rows[-1] if rows else None
+    
+    page = {
+        'items': [row[3] for row in rows],
+        'next_cursor': encode_cursor(last[0], last[2], -last[1]) if has_more else None,
+        'has_more': has_more
+    }
+    if cache_key and request.args.get('include_total', 'false').lower() == 'true':
+        page['total'] = sum(cached_total((cache_key, source), query)
+                            for source, (query, _) in enumerate(sources))
+    return page
@@ -0,0 +1,14 @@
+# backend/app/utils/sql.py
+from sqlalchemy.dialects import postgresql, sqlite
+from ..models import db
+
+# Dialects whose INSERT supports ON CONFLICT DO NOTHING / DO UPDATE
+_UPSERT_DIALECTS = {'sqlite': sqlite, 'postgresql': postgresql}
+
+
+def dialect_insert(table):
+    """INSERT construct with on_conflict_do_nothing/do_update for the bound database"""
+    name = db.session.get_bind().dialect.name
+    if name not in _UPSERT_DIALECTS:
+        raise NotImplementedError(f'ON CONFLICT inserts are not supported on {name}')
+    return _UPSERT_DIALECTS[name].insert(table)
@@ -0,0 +1,164 @@
+# backend/bench_counters.py
+"""Multi-threaded no-lost-update check for the atomic counter helpers.
+
+Seeds one student into a throwaway SQLite database, then has T threads hammer
+its points_balance: half add 1 point per operation through increment(), half
+spend 3 points through decrement_if_available(), each operation in its own
+transaction. Afterwards the balance must equal start + credits - 3 * successful
+debits (no lost update) and must never have gone negative (no overdraw).
+
+Before that, a single thread credits the student through the read-modify-write
+path the routes used to take (load the row, add in Python, flush) and through
+increment(), counting the SQL statements each issues per operation.
+
+    cd education_platform
+    python -m backend.bench_counters --threads 16 --ops 500
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+from sqlalchemy import event
+from sqlalchemy.exc import OperationalError
+from backend.app import create_app
+from backend.app.config import Config
+from backend.app.models import db
+from backend.app.models.user import User
+from backend.app.models.student import Student
+from backend.app.services.counter_service import increment, decrement_if_available
+
+
+def seed_student(balance):
+    user = User(email='counters@example.com', role='student', password_hash='!')
+    db.session.add(user)
+    db.session.flush()
+    student = Student(user_id=user.id, name='Counter Student', mobile='9000000000', points_balance=balance)
+    db.session.add(student)
+    db.session.commit()
+    return student.id
+
+
+def read_modify_write(student_id, delta):
+    # What the routes did before increment(): SELECT the row, then UPDATE it
+    student = db.session.get(Student, student_id)
+    student.points_balance += delta
+    db.session.flush()
+    return student.points_balance
+
+
+def count_statements(app, student_id, ops):
+    """Statements per credit and time per credit for the old and new paths"""
+    paths = {
+        'read_modify_write': read_modify_write,
+        'update_returning': lambda student_id, delta: increment(Student, 'points_balance', student_id, delta),
+    }
+    this_thread = threading.get_ident()
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        if threading.get_ident() == this_thread:
+            statements.append(statement)
+
+    report = {}
+    with app.app_context():
+        engine = db.engine
+        event.listen(engine, 'before_cursor_execute', count)
+        try:
+            for name, credit in paths.items():
+                statements.clear()
+                started = time.perf_counter()
+                for _ in range(ops):
+                    credit(student_id, 1)
+                    db.session.commit()
+                elapsed = time.perf_counter() - started
+                report[f'{name}_statements'] = round(len(statements) / ops, 2)
+                report[f'{name}_us'] = round(elapsed / ops * 1e6)
+        finally:
+            event.remove(engine, 'before_cursor_execute', count)
+            db.session.remove()
+    return report
+
+
+def run(threads, ops, start_balance=100):
+    db_path = os.path.join(tempfile.mkdtemp(prefix='counters-'), 'counters.db')
+    config = type('CounterTestConfig', (Config,), {
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{db_path}',
+        'STATE_BACKEND': 'memory'
+    })
+    app = create_app(config)
+    with app.app_context():
+        student_id = seed_student(start_balance)
+    statement_counts = count_statements(app, student_id, ops)
+    with app.app_context():
+        start_balance = db.session.get(Student, student_id).points_balance
+
+    credits = [0] * threads
+    debits = [0] * threads
+    lowest = [start_balance] * threads
+    retries = [0] * threads
+
+    def worker(index):
+        with app.app_context():
+            for _ in range(ops):
+                while True:
+                    try:
+                        if index % 2 == 0:
+                            balance = increment(Student, 'points_balance', student_id, 1)
+                        else:
+                            balance = decrement_if_available(Student, 'points_balance', student_id, 3)
+                        db.session.commit()
+                        break
+                    except OperationalError:
+                        # SQLite busy timeout; the statement did not apply
+                        db.session.rollback()
+                        retries[index] += 1
+                if balance is None:
+                    continue
+                if index % 2 == 0:
+                    credits[index] += 1
+                else:
+                    debits[index] += 1
+                lowest[index] = min(lowest[index], balance)
+            db.session.remove()
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    with app.app_context():
+        final = db.session.get(Student, student_id).points_balance
+
+    expected = start_balance + sum(credits) - 3 * sum(debits)
+    assert final == expected, f'lost update: balance {final}, ledger says {expected}'
+    assert min(lowest) >= 0, f'overdrawn: balance reached {min(lowest)}'
+    return {
+        'operations': threads * ops,
+        'credits': sum(credits),
+        'debits': sum(debits),
+        'refused_debits': (threads // 2) * ops - sum(debits),
+        'retries': sum(retries),
+        'final_balance': final,
+        'ops_per_s': round(threads * ops / elapsed),
+        **statement_counts,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--ops', type=int, default=500, help='operations per thread')
+    args = parser.parse_args()
+
+    report = run(args.threads, args.ops)
+    for key, value in report.items():
+        print(f'{key:>28}: {value}')
+    print('no lost updates, no overdraw')
+
+
+if __name__ == '__main__':
+    main()
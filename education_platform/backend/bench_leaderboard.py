@@ -0,0 +1,52 @@
+# backend/bench_leaderboard.py
+"""Leaderboard benchmark with a synthetic student population.
+
+Loads N random balances into the in-memory leaderboard, then times point
+updates, rank lookups, top-100 and neighbour queries.
+
+    cd education_platform
+    python -m backend.bench_leaderboard --students 1000000
+"""
+import argparse
+import random
+import time
+from backend.app.services.leaderboard_service import Leaderboard
+
+
+def timed(label, count, fn):
+    started = time.perf_counter()
+    for _ in range(count):
+        fn()
+    elapsed = time.perf_counter() - started
+    print(f'{label:14} {count / elapsed:>12,.0f} ops/s  ({elapsed * 1e6 / count:.1f} us/op)')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--students', type=int, default=1000000)
+    parser.add_argument('--ops', type=int, default=100000)
+    parser.add_argument('--max-points', type=int, default=50000)
+    args = parser.parse_args()
+
+    board = Leaderboard()
+    balances = {student_id: random.randint(0, args.max_points) for student_id in range(1, args.students + 1)}
+
+    started = time.perf_counter()
+    board.load('global', balances)
+    print(f'built board of {args.students:,} students in {time.perf_counter() - started:.2f}s')
+
+    pick = lambda: random.randint(1, args.students)
+
+    def update():
+        student_id = pick()
+        balances[student_id] += random.choice((10, 20, 30))
+        board.set_balance(student_id, balances[student_id])
+
+    timed('set_balance', args.ops, update)
+    timed('rank', args.ops, lambda: board.rank('global', pick()))
+    timed('top 100', args.ops // 100, lambda: board.top('global', 100))
+    timed('around (r=5)', args.ops // 10, lambda: board.around('global', pick(), 5))
+
+
+if __name__ == '__main__':
+    main()
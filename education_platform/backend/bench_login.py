@@ -0,0 +1,131 @@
+# backend/bench_login.py
+"""Login-storm benchmark: login throughput and signaling latency under load.
+
+Seeds N students with a real password hash into a throwaway SQLite database,
+matches one student/teacher pair over Socket.IO, then fires logins from T
+threads while the pair keeps relaying ICE candidates. Reports logins/s,
+login latency percentiles, and relay latency before and during the storm.
+Compare --hash-workers 0 (hashing on the request threads) with the default
+process pool.
+
+    cd education_platform
+    python -m backend.bench_login --students 200 --threads 32
+"""
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import threading
+import time
+from backend.app import create_app, socketio
+from backend.app.config import Config
+from backend.app.models import db
+from backend.app.models.user import User
+from backend.app.services.password_service import password_hasher
+from backend.loadtest import percentiles, seed_users, take
+
+PASSWORD = 'storm-password'
+
+
+def relay_latencies(student, teacher, room_id, stop, out):
+    while not stop.is_set():
+        t0 = time.perf_counter()
+        student.emit('webrtc_ice_candidate', {'room_id': room_id, 'candidate': {'candidate': 'candidate:1'}})
+        if take(teacher, 'webrtc_ice_candidate') is not None:
+            out.append((time.perf_counter() - t0) * 1000)
+        time.sleep(0.005)
+
+
+def run(students, threads, hash_workers):
+    db_path = os.path.join(tempfile.mkdtemp(prefix='loginstorm-'), 'loginstorm.db')
+    config = type('LoginStormConfig', (Config,), {
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{db_path}',
+        'STATE_BACKEND': 'memory',
+        'PASSWORD_HASH_WORKERS': hash_workers,
+        'PASSWORD_HASH_MAX_PENDING': threads
+    })
+    app = create_app(config)
+
+    with app.app_context():
+        student_ids, teacher_ids = seed_users(students, 1)
+        # Every account shares one hash: verification cost is what is measured
+        User.query.update({'password_hash': password_hasher.hash(PASSWORD)}, synchronize_session=False)
+        db.session.commit()
+        emails = [email for (email,) in db.session.query(User.email).filter(User.id.in_(student_ids))]
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        student = socketio.test_client(app)
+        teacher = socketio.test_client(app)
+        student.emit('student_join_queue', {'user_id': student_ids[0]})
+        teacher.emit('teacher_available', {'user_id': teacher_ids[0]})
+        room_id = take(teacher, 'match_found')['room_id']
+        student.get_received()
+
+        baseline = []
+        stop = threading.Event()
+        relay = threading.Thread(target=relay_latencies, args=(student, teacher, room_id, stop, baseline))
+        relay.start()
+        time.sleep(1)
+        stop.set()
+        relay.join()
+
+        login_ms = []
+        failures = []
+        during = []
+        stop = threading.Event()
+        relay = threading.Thread(target=relay_latencies, args=(student, teacher, room_id, stop, during))
+
+        def login(batch):
+            client = app.test_client()
+            for email in batch:
+                t0 = time.perf_counter()
+                response = client.post('/api/auth/student/login', json={'email': email, 'password': PASSWORD})
+                login_ms.append((time.perf_counter() - t0) * 1000)
+                if response.status_code != 200:
+                    failures.append(response.status_code)
+
+        workers = [threading.Thread(target=login, args=(emails[i::threads],)) for i in range(threads)]
+        relay.start()
+        started = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        elapsed = time.perf_counter() - started
+        stop.set()
+        relay.join()
+
+        student.disconnect()
+        teacher.disconnect()
+
+    return {
+        'logins': len(login_ms),
+        'failed': len(failures),
+        'logins_per_s': round(len(login_ms) / elapsed, 1),
+        'login_ms': percentiles(login_ms),
+        'relay_idle_ms': percentiles(baseline),
+        'relay_storm_ms': percentiles(during),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--students', type=int, default=200)
+    parser.add_argument('--threads', type=int, default=32)
+    parser.add_argument('--hash-workers', type=int, default=Config.PASSWORD_HASH_WORKERS,
+                        help='PASSWORD_HASH_WORKERS (0 hashes on the request threads)')
+    args = parser.parse_args()
+
+    report = run(args.students, args.threads, args.hash_workers)
+    print(f"{report['logins']} logins ({report['failed']} failed) from {args.threads} threads, "
+          f"{args.hash_workers} hash workers: {report['logins_per_s']} logins/s")
+    for name in ('login_ms', 'relay_idle_ms', 'relay_storm_ms'):
+        stats = report[name]
+        print(f"{name:15} " + '  '.join(
+            f'{k}={v:.2f}' if v is not None else f'{k}=-' for k, v in stats.items()
+        ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+# backend/bench_matching.py
+"""Microbenchmark for the matchmaking queue at growing queue sizes.
+
+For each size N the queue is filled with N waiting students, then enqueue,
+cancel-by-sid and teacher match (dequeue) are timed while the queue stays
+at about N entries. Per-operation cost should stay flat from 100 to 100k.
+
+    cd education_platform
+    python -m backend.bench_matching --sizes 100 1000 10000 100000
+"""
+import argparse
+import random
+import time
+from backend.app.services.matching_service import MatchingService
+
+
+def student(i):
+    return {'student_id': i, 'student_name': f'Student {i}', 'training_progress': 0}
+
+
+def measure(size, ops):
+    matching = MatchingService()
+    for i in range(size):
+        matching.student_join(f's{i}', student(i))
+    waiting = [f's{i}' for i in range(size)]
+    next_id = size
+
+    # Enqueue then cancel a random waiting student: size stays at N
+    started = time.perf_counter()
+    for _ in range(ops):
+        matching.student_join(f's{next_id}', student(next_id))
+        waiting.append(f's{next_id}')
+        next_id += 1
+    enqueue = (time.perf_counter() - started) / ops
+
+    random.shuffle(waiting)
+    started = time.perf_counter()
+    for _ in range(ops):
+        matching.remove(waiting.pop())
+    cancel = (time.perf_counter() - started) / ops
+
+    # Each teacher takes the student at the head of the queue
+    started = time.perf_counter()
+    for i in range(ops):
+        matching.teacher_available(f't{i}', {'teacher_id': i, 'teacher_name': f'Teacher {i}'})
+    dequeue = (time.perf_counter() - started) / ops
+
+    assert matching.waiting_count() == size - ops
+    return {'size': size, 'enqueue_us': enqueue * 1e6, 'cancel_us': cancel * 1e6, 'match_us': dequeue * 1e6}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000, 100000])
+    parser.add_argument('--ops', type=int, default=None, help='operations per size (default: size // 2)')
+    args = parser.parse_args()
+
+    print(f"{'waiting':>8} {'enqueue us':>11} {'cancel us':>10} {'match us':>9}")
+    for size in args.sizes:
+        row = measure(size, args.ops or max(1, size // 2))
+        print(f"{row['size']:>8} {row['enqueue_us']:>11.2f} {row['cancel_us']:>10.2f} {row['match_us']:>9.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+# backend/bench_scoring.py
+"""Throughput benchmark for keyword scoring of speaking answers.
+
+Generates random transcripts from a small vocabulary and scores them against
+questions with varying keyword counts, once through the cached scorer and
+once recompiling the keywords per transcript (the uncached baseline).
+
+    cd education_platform
+    python -m backend.bench_scoring --transcripts 100000 --words 60
+"""
+import argparse
+import json
+import random
+import time
+from backend.app.models.question import Question
+from backend.app.services.scoring_service import CompiledKeywords, keyword_scorer
+
+VOCABULARY = (
+    'i my name is age work working worked morning evening night wake up sleep '
+    'teacher student school office family friends weekend study learn english '
+    'every day usually after before breakfast lunch dinner go home read write'
+).split()
+
+
+def make_transcripts(count, words):
+    return [' '.join(random.choices(VOCABULARY, k=words)) for _ in range(count)]
+
+
+def run(transcripts, keyword_counts, words):
+    texts = make_transcripts(transcripts, words)
+    results = []
+    for question_id, keyword_count in enumerate(keyword_counts, start=1):
+        keywords = random.sample(VOCABULARY, keyword_count)
+        question = Question(id=question_id, question_type='speaking',
+                            expected_keywords=json.dumps(keywords))
+
+        started = time.perf_counter()
+        keyword_scorer.score_many(question, texts)
+        cached = time.perf_counter() - started
+
+        sample = texts[:max(1, len(texts) // 10)]
+        started = time.perf_counter()
+        for text in sample:
+            CompiledKeywords(json.loads(question.expected_keywords)).score(text)
+        uncached = (time.perf_counter() - started) * len(texts) / len(sample)
+
+        results.append({
+            'keywords': keyword_count,
+            'cached_per_sec': int(len(texts) / cached),
+            'uncached_per_sec': int(len(texts) / uncached)
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--transcripts', type=int, default=100000)
+    parser.add_argument('--words', type=int, default=60, help='words per transcript')
+    parser.add_argument('--keywords', type=int, nargs='+', default=[4, 8, 16])
+    args = parser.parse_args()
+
+    print(f'{args.transcripts} transcripts of {args.words} words')
+    for row in run(args.transcripts, args.keywords, args.words):
+        print(f"{row['keywords']:>3} keywords: {row['cached_per_sec']:>9} transcripts/s cached, "
+              f"{row['uncached_per_sec']:>9} transcripts/s recompiling")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+# backend/bench_sessions.py
+"""Disconnect stress test for the active session registry.
+
+Registers R rooms (2R participant sids), then disconnects every sid the way
+handle_disconnect does (room_for_sid, then remove) from several threads at
+once. Checks that each room is removed exactly once and the registry ends
+empty, and reports the time per disconnect.
+
+    cd education_platform
+    python -m backend.bench_sessions --rooms 25000 --threads 8
+    python -m backend.bench_sessions --rooms 25000 --backend sqlite
+"""
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime
+from backend.app.services.session_service import SessionRegistry
+from backend.app.services.state_backend import SQLiteStore, SQLiteSessionRegistry
+
+
+def create_registry(backend, directory):
+    if backend == 'sqlite':
+        store = SQLiteStore(os.path.join(directory, 'state.db'), uuid.uuid4().hex)
+        store.heartbeat()
+        return SQLiteSessionRegistry(store)
+    return SessionRegistry()
+
+
+def run(rooms, threads, backend='memory'):
+    with tempfile.TemporaryDirectory() as directory:
+        registry = create_registry(backend, directory)
+        sids = []
+        started = time.perf_counter()
+        for i in range(rooms):
+            registry.add(f'room-{i}', {
+                'student_sid': f's{i}',
+                'teacher_sid': f't{i}',
+                'student_id': i,
+                'teacher_id': i,
+                'start_time': datetime.utcnow()
+            })
+            sids += [f's{i}', f't{i}']
+        add_seconds = time.perf_counter() - started
+        random.shuffle(sids)
+
+        ended = []
+        lock = threading.Lock()
+
+        def disconnect(batch):
+            mine = []
+            for sid in batch:
+                room_id = registry.room_for_sid(sid)
+                if room_id and registry.remove(room_id):
+                    mine.append(room_id)
+            with lock:
+                ended.extend(mine)
+
+        workers = [threading.Thread(target=disconnect, args=(sids[i::threads],)) for i in range(threads)]
+        started = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        disconnect_seconds = time.perf_counter() - started
+
+        assert len(ended) == rooms and len(set(ended)) == rooms, 'a room was ended twice or not at all'
+        assert len(registry) == 0, 'rooms left after every sid disconnected'
+        assert all(registry.room_for_sid(sid) is None for sid in sids[:1000]), 'stale sid index entries'
+        return {
+            'rooms': rooms,
+            'sids': len(sids),
+            'add_seconds': add_seconds,
+            'disconnect_seconds': disconnect_seconds,
+            'per_disconnect_us': disconnect_seconds / len(sids) * 1e6,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rooms', type=int, default=25000)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--backend', choices=['memory', 'sqlite'], default='memory')
+    args = parser.parse_args()
+
+    report = run(args.rooms, args.threads, args.backend)
+    print(f"{report['sids']} sids across {report['rooms']} rooms ({args.backend}, {args.threads} threads)")
+    print(f"  register: {report['add_seconds']:.2f}s")
+    print(f"  disconnect all: {report['disconnect_seconds']:.2f}s "
+          f"({report['per_disconnect_us']:.1f} us per sid), every room ended exactly once")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+# backend/check_query_counts.py
+"""Per-endpoint SQL query counts for authenticated API requests.
+
+Seeds a student and a teacher (with a few sessions, transactions and
+redemptions) into a throwaway SQLite database and calls each endpoint through
+the Flask test client. Each endpoint is called once to warm the per-process
+caches, then measured; only statements issued on the request thread count,
+so background refresh threads do not skew the numbers. Exits non-zero if an
+endpoint goes over its budget.
+
+    cd education_platform
+    python -m backend.check_query_counts
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+from datetime import datetime, timedelta
+from sqlalchemy import event
+from backend.app import create_app
+from backend.app.config import Config
+from backend.app.models import db
+from backend.app.models.user import User
+from backend.app.models.student import Student
+from backend.app.models.teacher import Teacher
+from backend.app.models.session import VideoSession
+from backend.app.models.points import PointsTransaction, RedemptionRequest
+from backend.app.services.auth_service import create_user_token
+
+# (role, method, path, json body, query budget); the identity lookup is one query
+ENDPOINTS = [
+    ('student', 'GET', '/api/auth/me', None, 1),
+    ('student', 'GET', '/api/student/profile', None, 1),
+    ('student', 'GET', '/api/student/dashboard-stats', None, 2),
+    ('student', 'GET', '/api/points/balance', None, 1),
+    ('student', 'GET', '/api/points/history', None, 3),
+    ('student', 'GET', '/api/points/redemptions', None, 2),
+    ('student', 'GET', '/api/video/sessions', None, 2),
+    ('student', 'GET', '/api/training/questions?difficulty=easy&type=mcq&count=5', None, 3),
+    ('student', 'POST', '/api/training/submit-answers',
+     {'answers': [{'question_id': 1, 'answer': 'not an option'}]}, 2),
+    ('teacher', 'GET', '/api/auth/me', None, 1),
+    ('teacher', 'GET', '/api/teacher/profile', None, 1),
+    ('teacher', 'GET', '/api/teacher/dashboard-stats', None, 3),
+    ('teacher', 'GET', '/api/teacher/session-history', None, 2),
+    ('teacher', 'GET', '/api/video/sessions', None, 2),
+]
+
+
+def seed():
+    student_user = User(email='queries-student@example.com', role='student', password_hash='!')
+    teacher_user = User(email='queries-teacher@example.com', role='teacher', password_hash='!')
+    db.session.add_all([student_user, teacher_user])
+    db.session.flush()
+    student = Student(user_id=student_user.id, name='Query Student', mobile='9000000000', points_balance=500)
+    teacher = Teacher(user_id=teacher_user.id, name='Query Teacher', mobile='9000000000')
+    db.session.add_all([student, teacher])
+    db.session.flush()
+
+    now = datetime.utcnow()
+    for i in range(30):
+        start = now - timedelta(hours=i)
+        db.session.add(VideoSession(student_id=student.id, teacher_id=teacher.id, room_id=f'queries-{i}',
+                                    start_time=start, end_time=start + timedelta(minutes=5),
+                                    duration=300, status='completed', created_at=start))
+        db.session.add(PointsTransaction(student_id=student.id, points=10, transaction_type='earned',
+                                         description='Seeded', created_at=start))
+    for i in range(5):
+        db.session.add(RedemptionRequest(student_id=student.id, points_redeemed=10,
+                                         redemption_type='gift_card', status='approved'))
+    db.session.commit()
+    return {
+        'student': create_user_token(student_user, student),
+        'teacher': create_user_token(teacher_user, teacher),
+    }
+
+
+def run():
+    db_path = os.path.join(tempfile.mkdtemp(prefix='queries-'), 'queries.db')
+    config = type('QueryCountConfig', (Config,), {
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{db_path}',
+        'STATE_BACKEND': 'memory'
+    })
+    app = create_app(config)
+    with app.app_context():
+        tokens = seed()
+        engine = db.engine
+
+    request_thread = threading.get_ident()
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        if threading.get_ident() == request_thread:
+            statements.append(statement)
+
+    event.listen(engine, 'before_cursor_execute', count)
+    client = app.test_client()
+    results = []
+    for role, method, path, body, budget in ENDPOINTS:
+        headers = {'Authorization': f'Bearer {tokens[role]}'}
+        client.open(path, method=method, json=body, headers=headers)
+        statements.clear()
+        response = client.open(path, method=method, json=body, headers=headers)
+        results.append((role, method, path, response.status_code, len(statements), budget, list(statements)))
+    event.remove(engine, 'before_cursor_execute', count)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--verbose', action='store_true', help='print the SQL of each request')
+    args = parser.parse_args()
+
+    failed = False
+    for role, method, path, status, queries, budget, sql in run():
+        over = queries > budget or status >= 400
+        failed = failed or over
+        print(f"{'FAIL' if over else 'ok':<4} {role:<7} {method:<4} {path:<60} {status} "
+              f"{queries} queries (budget {budget})")
+        if args.verbose or over:
+            for statement in sql:
+                print(f'       {" ".join(statement.split())[:150]}')
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
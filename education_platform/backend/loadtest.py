@@ -0,0 +1,167 @@
+# backend/loadtest.py
+"""Socket.IO load test for matchmaking and signaling.
+
+Seeds N students and M teachers into a throwaway SQLite database, then drives
+every student through join -> match -> offer/answer/ICE -> end_call using
+Flask-SocketIO test clients inside this process. Teachers rejoin the pool
+after each call until every student has been served.
+
+    cd education_platform
+    python -m backend.loadtest --students 2000 --teachers 200
+"""
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+from backend.app import create_app, socketio
+from backend.app.config import Config
+from backend.app.models import db
+from backend.app.models.user import User
+from backend.app.models.student import Student
+from backend.app.models.teacher import Teacher
+from backend.app.services.session_writer import session_writer
+
+
+def percentiles(values):
+    if not values:
+        return {'p50': None, 'p95': None, 'p99': None, 'max': None}
+    values = sorted(values)
+    pick = lambda p: values[min(len(values) - 1, int(len(values) * p / 100))]
+    return {'p50': pick(50), 'p95': pick(95), 'p99': pick(99), 'max': values[-1]}
+
+
+def seed_users(students, teachers):
+    student_users = [User(email=f'loadtest-student-{i}@example.com', role='student', password_hash='!')
+                     for i in range(students)]
+    teacher_users = [User(email=f'loadtest-teacher-{i}@example.com', role='teacher', password_hash='!')
+                     for i in range(teachers)]
+    db.session.add_all(student_users + teacher_users)
+    db.session.flush()
+    db.session.add_all([Student(user_id=u.id, name=f'Student {i}', mobile='9000000000')
+                        for i, u in enumerate(student_users)])
+    db.session.add_all([Teacher(user_id=u.id, name=f'Teacher {i}', mobile='9000000000')
+                        for i, u in enumerate(teacher_users)])
+    db.session.commit()
+    return [u.id for u in student_users], [u.id for u in teacher_users]
+
+
+def take(client, event):
+    """Return the args of the first `event` received by client, or None"""
+    for packet in client.get_received():
+        if packet['name'] == event:
+            return packet['args'][0] if packet['args'] else {}
+    return None
+
+
+def run(students, teachers, quiet=True):
+    db_path = os.path.join(tempfile.mkdtemp(prefix='loadtest-'), 'loadtest.db')
+    config = type('LoadTestConfig', (Config,), {
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{db_path}',
+        'STATE_BACKEND': 'memory'
+    })
+    app = create_app(config)
+
+    with app.app_context():
+        student_ids, teacher_ids = seed_users(students, teachers)
+    student_by_name = {f'Student {i}': uid for i, uid in enumerate(student_ids)}
+
+    connect_ms, match_ms, relay_ms, end_call_ms = [], [], [], []
+    out = io.StringIO() if quiet else None
+    started = time.perf_counter()
+
+    with contextlib.redirect_stdout(out) if quiet else contextlib.nullcontext():
+        def connect():
+            t0 = time.perf_counter()
+            client = socketio.test_client(app)
+            connect_ms.append((time.perf_counter() - t0) * 1000)
+            client.get_received()
+            return client
+
+        teacher_clients = {uid: connect() for uid in teacher_ids}
+        student_clients = {uid: connect() for uid in student_ids}
+
+        # Queue every student, then bring teachers online; each teacher takes
+        # calls back to back until the queue is empty
+        joined_at = {}
+        for uid, client in student_clients.items():
+            joined_at[uid] = time.perf_counter()
+            client.emit('student_join_queue', {'user_id': uid})
+            client.get_received()
+
+        free_teachers = list(teacher_ids)
+        pending = set(student_ids)
+        completed = 0
+        while pending and free_teachers:
+            teacher_uid = free_teachers.pop(0)
+            teacher = teacher_clients[teacher_uid]
+            teacher.emit('teacher_available', {'user_id': teacher_uid})
+            match = take(teacher, 'match_found')
+            if match is None:
+                break
+
+            # Seeded student names are unique, so the partner name identifies the student
+            student_uid = student_by_name[match['partner_name']]
+            student = student_clients[student_uid]
+            pending.discard(student_uid)
+            if take(student, 'match_found') is not None:
+                match_ms.append((time.perf_counter() - joined_at[student_uid]) * 1000)
+            room_id = match['room_id']
+
+            for sender, receiver, event, payload in (
+                (student, teacher, 'webrtc_offer', {'offer': {'type': 'offer', 'sdp': 'v=0'}}),
+                (teacher, student, 'webrtc_answer', {'answer': {'type': 'answer', 'sdp': 'v=0'}}),
+                (student, teacher, 'webrtc_ice_candidate', {'candidate': {'candidate': 'candidate:1'}}),
+                (teacher, student, 'webrtc_ice_candidate', {'candidate': {'candidate': 'candidate:2'}}),
+            ):
+                t0 = time.perf_counter()
+                sender.emit(event, dict(payload, room_id=room_id))
+                if take(receiver, event) is not None:
+                    relay_ms.append((time.perf_counter() - t0) * 1000)
+
+            t0 = time.perf_counter()
+            student.emit('end_call', {'room_id': room_id})
+            end_call_ms.append((time.perf_counter() - t0) * 1000)
+            student.get_received()
+            teacher.get_received()
+            completed += 1
+            free_teachers.append(teacher_uid)
+
+        elapsed = time.perf_counter() - started
+        for client in list(teacher_clients.values()) + list(student_clients.values()):
+            client.disconnect()
+        session_writer.flush()
+
+    return {
+        'students': students,
+        'teachers': teachers,
+        'completed_calls': completed,
+        'elapsed_s': round(elapsed, 3),
+        'calls_per_s': round(completed / elapsed, 1) if elapsed else None,
+        'connect_ms': percentiles(connect_ms),
+        'match_ms': percentiles(match_ms),
+        'relay_ms': percentiles(relay_ms),
+        'end_call_ms': percentiles(end_call_ms),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--students', type=int, default=1000)
+    parser.add_argument('--teachers', type=int, default=100)
+    parser.add_argument('--verbose', action='store_true', help='show handler output')
+    args = parser.parse_args()
+
+    report = run(args.students, args.teachers, quiet=not args.verbose)
+    print(f"{report['completed_calls']} calls for {report['students']} students / "
+          f"{report['teachers']} teachers in {report['elapsed_s']}s ({report['calls_per_s']} calls/s)")
+    for name in ('connect_ms', 'match_ms', 'relay_ms', 'end_call_ms'):
+        stats = report[name]
+        print(f"{name:12} " + '  '.join(
+            f'{k}={v:.2f}' if v is not None else f'{k}=-' for k, v in stats.items()
+        ))
+
+
+if __name__ == '__main__':
+    main()
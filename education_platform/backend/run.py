@@ -1,9 +1,10 @@
 # backend/run.py
-import eventlet
-eventlet.monkey_patch()
-from backend.app import create_app, socketio
-
-app = create_app()
-
 if __name__ == '__main__':
-    socketio.run(app, debug=True, host='0.0.0.0', port=5000, allow_unsafe_werkzeug=True)
\ No newline at end of file
+    # Everything stays under the guard: password hashing workers start with
+    # forkserver/spawn and re-import this script
+    import eventlet
+    eventlet.monkey_patch()
+    from backend.app import create_app, socketio
+
+    app = create_app()
+    socketio.run(app, debug=True, host='0.0.0.0', port=5000, allow_unsafe_werkzeug=True)
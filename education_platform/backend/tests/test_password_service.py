@@ -0,0 +1,27 @@
+# backend/tests/test_password_service.py
+"""Rehash decisions for stored password hashes."""
+from werkzeug.security import generate_password_hash
+from backend.app.services.password_service import PasswordHasher
+
+
+def hasher(method):
+    hasher = PasswordHasher()
+    hasher.init_app(type('App', (), {'config': {
+        'PASSWORD_HASH_METHOD': method,
+        'PASSWORD_HASH_WORKERS': 0,
+        'PASSWORD_HASH_QUEUE_TIMEOUT': 1,
+        'PASSWORD_HASH_MAX_PENDING': 1
+    }})())
+    return hasher
+
+
+def test_short_method_name_matches_its_own_hashes():
+    for method in ('scrypt', 'pbkdf2', 'pbkdf2:sha256'):
+        assert not hasher(method).needs_rehash(generate_password_hash('secret', method))
+
+
+def test_changed_parameters_need_rehash():
+    stored = generate_password_hash('secret', 'scrypt:16384:8:1')
+    assert hasher('scrypt').needs_rehash(stored)
+    assert hasher('pbkdf2').needs_rehash(stored)
+    assert not hasher('scrypt:16384:8:1').needs_rehash(stored)
@@ -0,0 +1,182 @@
+# backend/tests/test_schema_upgrade.py
+"""Starting the app against a database created by the original schema."""
+import sqlite3
+from backend.app import create_app
+from backend.app.config import Config
+from backend.app.models import db
+from backend.app.models.student import Student
+from backend.app.models.question import Question, AnsweredQuestion
+from backend.app.models.schema_migration import SchemaMigration
+
+# Tables as created by the first release, before any upgrade step
+BASELINE_SCHEMA = """
+CREATE TABLE users (
+    id INTEGER NOT NULL, 
+    email VARCHAR(120) NOT NULL, 
+    password_hash VARCHAR(255) NOT NULL, 
+    role VARCHAR(20) NOT NULL, 
+    is_active BOOLEAN, 
+    created_at DATETIME, 
+    updated_at DATETIME, 
+    PRIMARY KEY (id)
+);
+CREATE UNIQUE INDEX ix_users_email ON users (email);
+CREATE TABLE questions (
+    id INTEGER NOT NULL, 
+    question_text TEXT NOT NULL, 
+    question_type VARCHAR(20) NOT NULL, 
+    difficulty VARCHAR(20), 
+    points_value INTEGER NOT NULL, 
+    option_a VARCHAR(200), 
+    option_b VARCHAR(200), 
+    option_c VARCHAR(200), 
+    option_d VARCHAR(200), 
+    correct_answer VARCHAR(1), 
+    expected_keywords TEXT, 
+    is_active BOOLEAN, 
+    created_at DATETIME, 
+    PRIMARY KEY (id)
+);
+CREATE TABLE students (
+    id INTEGER NOT NULL, 
+    user_id INTEGER NOT NULL, 
+    name VARCHAR(100) NOT NULL, 
+    age INTEGER, 
+    education VARCHAR(200), 
+    profession VARCHAR(100), 
+    mobile VARCHAR(15), 
+    points_balance INTEGER, 
+    total_video_time INTEGER, 
+    training_progress INTEGER, 
+    created_at DATETIME, 
+    PRIMARY KEY (id), 
+    UNIQUE (user_id), 
+    FOREIGN KEY(user_id) REFERENCES users (id)
+);
+CREATE TABLE teachers (
+    id INTEGER NOT NULL, 
+    user_id INTEGER NOT NULL, 
+    name VARCHAR(100) NOT NULL, 
+    age INTEGER, 
+    education VARCHAR(200), 
+    profession VARCHAR(100), 
+    mobile VARCHAR(15) NOT NULL, 
+    total_teaching_time INTEGER, 
+    is_available BOOLEAN, 
+    created_at DATETIME, 
+    PRIMARY KEY (id), 
+    UNIQUE (user_id), 
+    FOREIGN KEY(user_id) REFERENCES users (id)
+);
+CREATE TABLE points_transactions (
+    id INTEGER NOT NULL, 
+    student_id INTEGER NOT NULL, 
+    points INTEGER NOT NULL, 
+    transaction_type VARCHAR(20) NOT NULL, 
+    description VARCHAR(200), 
+    question_id INTEGER, 
+    created_at DATETIME, 
+    PRIMARY KEY (id), 
+    FOREIGN KEY(student_id) REFERENCES students (id), 
+    FOREIGN KEY(question_id) REFERENCES questions (id)
+);
+CREATE TABLE redemption_requests (
+    id INTEGER NOT NULL, 
+    student_id INTEGER NOT NULL, 
+    points_redeemed INTEGER NOT NULL, 
+    redemption_type VARCHAR(50) NOT NULL, 
+    upi_id VARCHAR(100), 
+    status VARCHAR(20), 
+    created_at DATETIME, 
+    processed_at DATETIME, 
+    PRIMARY KEY (id), 
+    FOREIGN KEY(student_id) REFERENCES students (id)
+);
+CREATE TABLE video_sessions (
+    id INTEGER NOT NULL, 
+    student_id INTEGER NOT NULL, 
+    teacher_id INTEGER NOT NULL, 
+    room_id VARCHAR(100) NOT NULL, 
+    start_time DATETIME, 
+    end_time DATETIME, 
+    duration INTEGER, 
+    status VARCHAR(20), 
+    created_at DATETIME, 
+    PRIMARY KEY (id), 
+    FOREIGN KEY(student_id) REFERENCES students (id), 
+    FOREIGN KEY(teacher_id) REFERENCES teachers (id), 
+    UNIQUE (room_id)
+);
+"""
+
+
+def baseline_db(path):
+    conn = sqlite3.connect(path)
+    conn.executescript(BASELINE_SCHEMA)
+    conn.executescript("""
+        INSERT INTO users (id, email, password_hash, role, is_active)
+            VALUES (1, 'old-student@example.com', '!', 'student', 1);
+        INSERT INTO students (id, user_id, name, points_balance, total_video_time, training_progress)
+            VALUES (1, 1, 'Old Student', 30, 0, 0);
+        INSERT INTO questions (id, question_text, question_type, difficulty, points_value, correct_answer, is_active)
+            VALUES (1, 'Q1', 'mcq', 'easy', 10, 'A', 1),
+                   (2, 'Q2', 'mcq', 'easy', 10, 'A', 1),
+                   (3, 'Q3', 'mcq', 'easy', 10, 'A', 1);
+        INSERT INTO points_transactions (student_id, points, transaction_type, question_id, created_at)
+            VALUES (1, 10, 'earned', 1, '2026-01-01 00:00:00'),
+                   (1, 10, 'earned', 2, '2026-01-02 00:00:00'),
+                   (1, 10, 'earned', 2, '2026-01-03 00:00:00');
+    """)
+    conn.commit()
+    conn.close()
+
+
+def start(tmp_path, db_path):
+    config = type('UpgradeTestConfig', (Config,), {
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{db_path}',
+        'STATE_BACKEND': 'memory',
+        'SESSION_WRITER_SPILL_PATH': str(tmp_path / 'spill.jsonl'),
+        'REDEMPTION_PAYOUT_ADAPTER': None
+    })
+    return create_app(config)
+
+
+def progress(app):
+    with app.app_context():
+        student = db.session.get(Student, 1)
+        answered = {row.question_id for row in AnsweredQuestion.query.filter_by(student_id=1)}
+        applied = {row.name for row in SchemaMigration.query}
+        total = Question.query.filter_by(is_active=True).count()
+        return student.questions_answered, student.training_progress, total, answered, applied
+
+
+def test_upgrade_backfills_training_progress(tmp_path):
+    db_path = tmp_path / 'baseline.db'
+    baseline_db(db_path)
+    
+    app = start(tmp_path, db_path)
+    
+    questions_answered, training_progress, total, answered, applied = progress(app)
+    assert answered == {1, 2}
+    assert questions_answered == 2
+    assert training_progress == 2 * 100 // total
+    assert 'training_progress' in applied
+
+
+def test_interrupted_backfill_is_retried_on_next_start(tmp_path):
+    db_path = tmp_path / 'baseline.db'
+    baseline_db(db_path)
+    app = start(tmp_path, db_path)
+    
+    # As if the first start had added the columns and then died before the backfill committed
+    with app.app_context():
+        AnsweredQuestion.query.delete()
+        SchemaMigration.query.delete()
+        db.session.query(Student).update({'questions_answered': 0, 'training_progress': 0})
+        db.session.commit()
+    
+    app = start(tmp_path, db_path)
+    questions_answered, _, _, answered, applied = progress(app)
+    assert answered == {1, 2}
+    assert questions_answered == 2
+    assert 'training_progress' in applied
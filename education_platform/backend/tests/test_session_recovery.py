@@ -0,0 +1,53 @@
+# backend/tests/test_session_recovery.py
+"""Sessions spilled by a stopped process are recovered on the next start."""
+import json
+from datetime import datetime, timedelta
+from backend.app import create_app
+from backend.app.config import Config
+from backend.app.models import db
+from backend.app.models.user import User
+from backend.app.models.student import Student
+from backend.app.models.teacher import Teacher
+from backend.app.models.session import VideoSession
+from backend.app.services.recovery_service import recovery
+
+
+def test_spilled_start_is_recovered(tmp_path):
+    spill_path = tmp_path / 'spill.jsonl'
+    config = type('RecoveryTestConfig', (Config,), {
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'app.db'}",
+        'STATE_BACKEND': 'memory',
+        'SESSION_WRITER_SPILL_PATH': str(spill_path),
+        'REDEMPTION_PAYOUT_ADAPTER': None
+    })
+    app = create_app(config)
+    with app.app_context():
+        student_user = User(email='spill-student@example.com', role='student', password_hash='!')
+        teacher_user = User(email='spill-teacher@example.com', role='teacher', password_hash='!')
+        db.session.add_all([student_user, teacher_user])
+        db.session.flush()
+        student = Student(user_id=student_user.id, name='Spill Student', mobile='9000000000')
+        teacher = Teacher(user_id=teacher_user.id, name='Spill Teacher', mobile='9000000000')
+        db.session.add_all([student, teacher])
+        db.session.commit()
+        student_id, teacher_id = student.id, teacher.id
+
+    # What a previous process left behind when the database was down at shutdown
+    start_time = (datetime.utcnow() - timedelta(minutes=5)).isoformat()
+    spill_path.write_text(json.dumps({'kind': 'start', 'data': {
+        'room_id': 'spilled-room',
+        'student_id': student_id,
+        'teacher_id': teacher_id,
+        'start_time': start_time,
+        'created_at': start_time,
+        'status': 'active',
+        'worker_id': 'stopped-worker'
+    }}) + '\n')
+
+    app = create_app(config)
+
+    with app.app_context():
+        session = VideoSession.query.filter_by(room_id='spilled-room').one()
+        assert session.status == 'active'
+    assert 'spilled-room' in recovery._orphaned
+    assert not spill_path.exists()
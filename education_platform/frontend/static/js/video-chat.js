@@ -49,6 +49,17 @@ socket.on('connected', (data) => {
     console.log('Connected to socket server:', data.sid);
 });
 
+// After a server restart, rejoin the call we were in
+socket.on('connect', () => {
+    if (currentRoomId) {
+        socket.emit('resume_session', { room_id: currentRoomId, user_id: user.id });
+    }
+});
+
+socket.on('session_resumed', (data) => {
+    console.log('Session resumed:', data.room_id);
+});
+
 socket.on('waiting', (data) => {
     console.log(data.message);
 });
@@ -221,6 +232,11 @@ function startTimer() {
     }, 1000);
 }
 
+// Heartbeat so the server keeps our queue entry and call alive
+setInterval(() => {
+    socket.emit('heartbeat');
+}, 15000);
+
 // Initialize on page load
 initVideoChat();
 